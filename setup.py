@@ -13,6 +13,9 @@ setup(
         "websockets>=10.0",
         "python-multipart>=0.0.5",
         "aiofiles>=0.8.0",
+        "orjson>=3.10.0",
+        "msgspec>=0.18.0",
+        "uvloop>=0.19.0; sys_platform != 'win32'",
     ],
     python_requires=">=3.9",
     author="Your Name",
@@ -3,13 +3,22 @@
 提供基于大语言模型的德州扑克AI智能体实现。
 """
 
+import importlib
+
 from src.agents.base import Agent, GameObservation
-from src.agents.llm import LLMAgent
-from src.agents.memory import Memory, MemoryManager
 from src.engine.game import TexasHoldemGame, ActionType, PlayerAction
 from src.engine.state import GameState, PlayerState, GameStage
 from src.engine.rules import HandEvaluator, HandResult
 from src.engine.dealer import Dealer
 from src.utils.logger import get_logger
 
-__version__ = "0.1.0" 
\ No newline at end of file
+__version__ = "0.1.0"
+
+def __getattr__(name: str):
+    """LLMAgent、Memory等较重的智能体实现交给src.agents按需导入"""
+    agents = importlib.import_module("src.agents")
+    if name not in agents._LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(agents, name)
+    globals()[name] = value
+    return value
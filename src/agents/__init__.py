@@ -3,9 +3,9 @@
 包含各种类型的智能体实现。
 """
 
+import importlib
+
 from src.agents.base import Agent, GameObservation
-from src.agents.llm import LLMAgent
-from src.agents.memory import Memory, MemoryManager
 
 __all__ = [
     'Agent',
@@ -13,4 +13,20 @@ __all__ = [
     'LLMAgent',
     'Memory',
     'MemoryManager',
-] 
\ No newline at end of file
+]
+
+# LLMAgent和记忆模块依赖litellm、chromadb等较重的库，首次访问时才导入
+_LAZY_IMPORTS = {
+    "LLMAgent": "src.agents.llm",
+    "Memory": "src.agents.memory",
+    "MemoryManager": "src.agents.memory",
+}
+
+def __getattr__(name: str):
+    """按需导入较重的智能体实现"""
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
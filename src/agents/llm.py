@@ -7,17 +7,46 @@ import json
 import yaml
 import os
 from typing import Dict, List, Any, Union, Optional
-from datetime import datetime
+from collections import OrderedDict
+from datetime import datetime, timezone
 import time
 
 from litellm import completion
 from src.agents.base import Agent, GameObservation
-from src.engine.game import ActionType, PlayerAction
+from src.engine.game import ActionType, ACTION_TYPES, PlayerAction
 from src.utils.logger import get_logger
 from src.utils.config import load_config
 
 logger = get_logger(__name__)
 
+# 提示词缓存的最大条目数
+PROMPT_CACHE_SIZE = 64
+
+# 动作时间戳统一使用UTC，与Web服务端一致
+_UTC = timezone.utc
+
+# 复用同一个解码器，raw_decode在定位到的"{"处一次完成JSON对象的扫描和解析
+_JSON_DECODER = json.JSONDecoder()
+
+def _decode_json(text: str) -> Dict[str, Any]:
+    """
+    解析文本中第一个JSON对象，忽略其前后的说明文字和markdown代码块标记
+    
+    Args:
+        text: LLM响应文本
+        
+    Returns:
+        Dict[str, Any]: 解析出的JSON对象
+        
+    Raises:
+        json.JSONDecodeError: 找不到合法的JSON对象
+    """
+    start = text.find("{")
+    if start < 0:
+        # 数组、数字等非对象的回复不是合法的决策
+        raise json.JSONDecodeError("响应中没有JSON对象", text, 0)
+    return _JSON_DECODER.raw_decode(text, start)[0]
+
 class LLMAgent(Agent):
     """基于大语言模型的智能体"""
     
@@ -53,6 +82,9 @@ class LLMAgent(Agent):
         # 加载提示词模板
         self.prompt_template = config["prompts"]["decision_making"]
         
+        # 提示词缓存: 观察状态键 -> 渲染好的提示词（LRU）
+        self._prompt_cache: "OrderedDict[tuple, str]" = OrderedDict()
+        
         logger.info(f"LLM Agent {agent_id} 初始化完成，使用模型 {self.model_config['model']}，性格: {self.description}")
     
     def observe(self, observation: GameObservation) -> None:
@@ -60,6 +92,11 @@ class LLMAgent(Agent):
         super().observe(observation)
         logger.info(f"AI玩家 {self.agent_id} 观察到新的游戏状态")
     
+    def reset(self) -> None:
+        """重置智能体状态并清空提示词缓存"""
+        super().reset()
+        self._prompt_cache.clear()
+    
     def act(self) -> PlayerAction:
         """使用LLM生成动作"""
         if not self.current_observation:
@@ -86,7 +123,7 @@ class LLMAgent(Agent):
                     raise ValueError("LLM决策验证失败")
                     
                 # 创建动作
-                action_type = ActionType[decision["action"]["type"]]
+                action_type = ACTION_TYPES[decision["action"]["type"]]
                 amount = decision["action"].get("amount", 0)
                 
                 # 验证金额
@@ -103,7 +140,7 @@ class LLMAgent(Agent):
                     player_id=self.agent_id,
                     action_type=action_type,
                     amount=amount,
-                    timestamp=datetime.now(),
+                    timestamp=datetime.now(_UTC),
                     table_talk=decision.get("table_talk", None)  # 添加table_talk
                 )
                 
@@ -114,7 +151,8 @@ class LLMAgent(Agent):
                 retry_count += 1
                 last_error = str(e)
                 logger.warning(f"决策生成失败 (尝试 {retry_count}/{max_retries}): {last_error}")
-                time.sleep(1)  # 短暂等待后重试
+                if retry_count < max_retries:
+                    time.sleep(1)  # 短暂等待后重试，最后一次失败后直接返回默认动作
         
         # 如果所有重试都失败，返回弃牌动作
         logger.error(f"达到最大重试次数，选择弃牌。最后一次错误: {last_error}")
@@ -122,7 +160,7 @@ class LLMAgent(Agent):
             player_id=self.agent_id,
             action_type=ActionType.CALL,
             amount=0,
-            timestamp=datetime.now()
+            timestamp=datetime.now(_UTC)
         )
     
     def _get_default_action(self, error: str) -> PlayerAction:
@@ -137,14 +175,14 @@ class LLMAgent(Agent):
                     player_id=self.agent_id,
                     action_type=ActionType.ALL_IN,
                     amount=self.current_observation.chips,
-                    timestamp=datetime.now()
+                    timestamp=datetime.now(_UTC)
                 )
             else:
                 return PlayerAction(
                     player_id=self.agent_id,
                     action_type=ActionType.FOLD,
                     amount=0,
-                    timestamp=datetime.now()
+                    timestamp=datetime.now(_UTC)
                 )
         
         # 默认选择跟注，如果筹码不足则弃牌
@@ -154,21 +192,55 @@ class LLMAgent(Agent):
                 player_id=self.agent_id,
                 action_type=ActionType.CALL,
                 amount=call_amount,
-                timestamp=datetime.now()
+                timestamp=datetime.now(_UTC)
             )
         else:
             return PlayerAction(
                 player_id=self.agent_id,
                 action_type=ActionType.FOLD,
                 amount=0,
-                timestamp=datetime.now()
+                timestamp=datetime.now(_UTC)
             )
     
+    def _prompt_key(self, last_error: Optional[str] = None) -> tuple:
+        """
+        根据当前观察中影响提示词的字段生成缓存键
+        
+        Args:
+            last_error: 上一次决策的错误信息
+            
+        Returns:
+            tuple: 缓存键
+        """
+        obs = self.current_observation
+        return (
+            str(obs.phase), obs.position, tuple(obs.hand_cards), tuple(obs.community_cards),
+            obs.pot_size, obs.current_bet, obs.min_raise, obs.chips,
+            tuple((opp['player_id'], opp['chips'], opp['current_bet'], opp['is_active'])
+                  for opp in obs.opponents),
+            tuple((a.player_id, a.action_type, a.amount) for a in obs.round_actions),
+            last_error
+        )
+    
     def _generate_prompt(self, last_error: Optional[str] = None) -> str:
-        """生成提示词"""
+        """生成提示词，相同的观察状态直接复用缓存的结果"""
         if not self.current_observation:
             raise ValueError("No observation available")
             
+        key = self._prompt_key(last_error)
+        prompt = self._prompt_cache.get(key)
+        if prompt is not None:
+            self._prompt_cache.move_to_end(key)
+            return prompt
+            
+        prompt = self._render_prompt(last_error)
+        self._prompt_cache[key] = prompt
+        if len(self._prompt_cache) > PROMPT_CACHE_SIZE:
+            self._prompt_cache.popitem(last=False)
+        return prompt
+    
+    def _render_prompt(self, last_error: Optional[str] = None) -> str:
+        """渲染提示词模板"""
         # 格式化手牌
         hand_cards = ", ".join(self.current_observation.hand_cards)
         
@@ -207,20 +279,20 @@ class LLMAgent(Agent):
         # 添加上一次错误信息（如果有）
         error_context = f"\n上一次决策错误: {last_error}\n请避免重复此错误。" if last_error else ""
         
-        # 渲染提示词模板
-        prompt = self.prompt_template.format(
-            hand_cards=hand_cards,
-            community_cards=community_cards,
-            phase=str(self.current_observation.phase),
-            position=self.current_observation.position,
-            pot_size=self.current_observation.pot_size,
-            current_bet=current_max_bet,
-            min_raise=min_raise_to,
-            chips=self.current_observation.chips,
-            opponents=opponents,
-            round_actions=player_actions,
-            historical_context=f"你是一个{self.description}{error_context}"
-        )
+        # 渲染提示词模板（format_map直接读取字典，不再展开为关键字参数）
+        prompt = self.prompt_template.format_map({
+            "hand_cards": hand_cards,
+            "community_cards": community_cards,
+            "phase": str(self.current_observation.phase),
+            "position": self.current_observation.position,
+            "pot_size": self.current_observation.pot_size,
+            "current_bet": current_max_bet,
+            "min_raise": min_raise_to,
+            "chips": self.current_observation.chips,
+            "opponents": opponents,
+            "round_actions": player_actions,
+            "historical_context": f"你是一个{self.description}{error_context}"
+        })
         
         return prompt
     
@@ -265,27 +337,9 @@ class LLMAgent(Agent):
     def _parse_response(self, response: str) -> Dict[str, Any]:
         """解析LLM响应"""
         try:
-            # 清理响应文本
-            response = response.strip()
-            json_str = response
-            
-            # 尝试提取JSON（处理可能的markdown格式）
-            if response.startswith("```"):
-                lines = response.split("\n")
-                start_idx = 1
-                if lines[1].lower().startswith("json"):
-                    start_idx = 2
-                end_idx = -1
-                if lines[-1].strip() == "```":
-                    end_idx = -1
-                json_str = "\n".join(lines[start_idx:end_idx])
-            
-            # 清理和规范化JSON字符串
-            json_str = json_str.strip()
-            
-            # 解析JSON
+            # 解析响应中的第一个完整JSON对象（兼容markdown代码块和前后的说明文字）
             try:
-                decision = json.loads(json_str)
+                decision = _decode_json(response)
             except json.JSONDecodeError as e:
                 logger.error(f"JSON解析失败: {e}")
                 raise
@@ -363,9 +417,7 @@ class LLMAgent(Agent):
                 
             # 验证动作类型是否有效
             action_type_str = action["type"]
-            try:
-                ActionType[action_type_str]
-            except KeyError:
+            if action_type_str not in ACTION_TYPES:
                 logger.error(f"无效的动作类型: {action_type_str}")
                 return False
                 
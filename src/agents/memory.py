@@ -3,11 +3,14 @@
 实现智能体的短期和长期记忆管理。
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Deque, Dict, List, Optional, Any
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 import json
 import os
+import pickle
+import uuid
 
 import chromadb
 from chromadb.config import Settings
@@ -42,22 +45,22 @@ class MemoryManager:
         self.long_term_config = config["memory"]["long_term"]
         
         # 短期记忆
-        self.short_term_memory: List[Memory] = []
         self.max_rounds = self.short_term_config["max_rounds"]
+        self.short_term_memory: Deque[Memory] = deque(maxlen=self.max_rounds)
         
-        # 长期记忆
-        persist_dir = os.path.join("data", "memories")
-        if not os.path.exists(persist_dir):
-            os.makedirs(persist_dir)
-            
+        # 长期记忆（persistent为false时使用进程内的临时向量库，不写磁盘）
         try:
-            self.chroma_client = chromadb.PersistentClient(
-                path=persist_dir,
-                settings=Settings(
-                    anonymized_telemetry=False,
-                    allow_reset=True
-                )
+            settings = Settings(
+                anonymized_telemetry=False,
+                allow_reset=True
             )
+            if self.long_term_config.get("persistent", True):
+                persist_dir = os.path.join("data", "memories")
+                if not os.path.exists(persist_dir):
+                    os.makedirs(persist_dir)
+                self.chroma_client = chromadb.PersistentClient(path=persist_dir, settings=settings)
+            else:
+                self.chroma_client = chromadb.EphemeralClient(settings=settings)
             self.collection = self._init_collection()
         except Exception as e:
             logger.error(f"初始化向量数据库失败: {e}")
@@ -69,20 +72,13 @@ class MemoryManager:
         """初始化向量数据库集合"""
         collection_name = self.long_term_config["collection"]
         try:
-            # 检查集合是否存在
-            try:
-                collection = self.chroma_client.get_collection(collection_name)
-                logger.info(f"使用已存在的集合: {collection_name}")
-                return collection
-            except Exception:
-                # 集合不存在，创建新的集合
-                collection = self.chroma_client.create_collection(
-                    name=collection_name,
-                    metadata={"description": "Poker game memories"}
-                )
-                logger.info(f"创建新集合: {collection_name}")
-                return collection
-                
+            # 集合存在则直接使用，不存在则创建
+            collection = self.chroma_client.get_or_create_collection(
+                name=collection_name,
+                metadata={"description": "Poker game memories"}
+            )
+            logger.info(f"使用向量数据库集合: {collection_name}")
+            return collection
         except Exception as e:
             logger.error(f"初始化集合失败: {e}")
             raise
@@ -94,36 +90,43 @@ class MemoryManager:
         Args:
             memory: 记忆数据
         """
+        self.add_memories([memory])
+        
+        logger.debug(f"Added memory at {memory.timestamp}")
+    
+    def add_memories(self, memories: List[Memory]) -> None:
+        """
+        批量添加记忆，向量数据库只写入一次
+        
+        Args:
+            memories: 记忆数据列表
+        """
+        if not memories:
+            return
+            
         # 更新短期记忆
-        self.short_term_memory.append(memory)
-        if len(self.short_term_memory) > self.max_rounds:
-            self.short_term_memory.pop(0)
+        self.short_term_memory.extend(memories)  # 超出max_rounds时deque自动丢弃最旧的记忆
         
         # 更新长期记忆
-        self._store_in_vector_db(memory)
-        
-        logger.debug(f"Added memory at {memory.timestamp}")
+        self._store_in_vector_db(memories)
     
-    def _store_in_vector_db(self, memory: Memory) -> None:
+    def _store_in_vector_db(self, memories: List[Memory]) -> None:
         """
-        将记忆存储到向量数据库
+        将记忆批量存储到向量数据库
         
         Args:
-            memory: 记忆数据
+            memories: 记忆数据列表
         """
         try:
-            # 将记忆转换为文本
-            text = self._memory_to_text(memory)
-            
-            # 存储到向量数据库
+            # 存储到向量数据库，一次add写入所有记忆
             self.collection.add(
-                documents=[text],
+                documents=[self._memory_to_text(memory) for memory in memories],
                 metadatas=[{
                     "timestamp": memory.timestamp.isoformat(),
                     "phase": memory.phase,
                     **memory.metadata
-                }],
-                ids=[f"memory_{datetime.now().timestamp()}"]
+                } for memory in memories],
+                ids=[f"memory_{uuid.uuid4().hex}" for _ in memories]
             )
         except Exception as e:
             logger.error(f"存储记忆到向量数据库失败: {e}")
@@ -201,12 +204,12 @@ class MemoryManager:
             List[Memory]: 记忆列表
         """
         if n is None:
-            return self.short_term_memory
-        return self.short_term_memory[-n:]
+            return list(self.short_term_memory)
+        return list(self.short_term_memory)[-n:]
     
     def clear_short_term(self) -> None:
         """清空短期记忆"""
-        self.short_term_memory = []
+        self.short_term_memory.clear()
         logger.info("Short-term memory cleared")
     
     def prune_long_term(self, days: int = 5) -> None:
@@ -224,11 +227,18 @@ class MemoryManager:
     
     def save(self, path: str) -> None:
         """
-        保存记忆状态
+        保存记忆状态，.pkl后缀使用pickle保存本地快照，其他后缀导出为JSON
         
         Args:
             path: 保存路径
         """
+        if path.endswith(".pkl"):
+            with open(path, "wb") as f:
+                pickle.dump({"short_term": list(self.short_term_memory)}, f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            logger.info(f"Memory state saved to {path}")
+            return
+            
         state = {
             "short_term": [
                 {
@@ -252,15 +262,22 @@ class MemoryManager:
     
     def load(self, path: str) -> None:
         """
-        加载记忆状态
+        加载记忆状态，按文件后缀选择pickle或JSON格式
         
         Args:
             path: 加载路径
         """
+        if path.endswith(".pkl"):
+            with open(path, "rb") as f:
+                state = pickle.load(f)
+            self.short_term_memory = deque(state["short_term"], maxlen=self.max_rounds)
+            logger.info(f"Memory state loaded from {path}")
+            return
+            
         with open(path, "r") as f:
             state = json.load(f)
             
-        self.short_term_memory = [
+        self.short_term_memory = deque((
             Memory(
                 timestamp=datetime.fromisoformat(m["timestamp"]),
                 phase=m["phase"],
@@ -272,7 +289,7 @@ class MemoryManager:
                 metadata=m["metadata"]
             )
             for m in state["short_term"]
-        ]
+        ), maxlen=self.max_rounds)
         
         logger.info(f"Memory state loaded from {path}")
 
@@ -5,14 +5,18 @@
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Depends, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from typing import Dict, List, Optional, Any
 import json
-from datetime import datetime
+import orjson
+from datetime import datetime, timezone
 import asyncio
+import os
+import uuid
 from contextlib import asynccontextmanager
 from pydantic import BaseModel
 
-from src.engine.game import TexasHoldemGame as Game, ActionType, PlayerAction
+from src.engine.game import TexasHoldemGame as Game, ActionType, ACTION_TYPES, PlayerAction
 from src.engine.state import PlayerState, GameState
 from src.agents.llm import LLMAgent
 from src.utils.logger import get_logger
@@ -22,6 +26,9 @@ from src.api.models import GameConfig, GameState, PlayerInfo, WebSocketMessage
 # 获取日志记录器
 logger = get_logger(__name__)
 
+# 多进程部署时的工作进程编号，作为游戏ID前缀以便代理按游戏路由
+WORKER_ID = os.getenv("POKER_WORKER_ID")
+
 # 存储活动游戏和连接
 active_games: Dict[str, Game] = {}
 active_connections: Dict[str, List[WebSocket]] = {}
@@ -51,6 +58,7 @@ app = FastAPI(
     title="Texas Hold'em with LLM",
     description="基于大语言模型的多人德州扑克游戏系统",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -96,7 +104,9 @@ async def create_game(config: GameConfig):
     """创建新游戏"""
     try:
         # 生成游戏ID
-        game_id = str(int(datetime.now().timestamp()))
+        # 使用uuid避免同一秒内创建的游戏互相覆盖；多进程部署时加上工作进程编号前缀，
+        # 以便代理把同一游戏的请求转发到持有该游戏的进程
+        game_id = f"{WORKER_ID}-{uuid.uuid4()}" if WORKER_ID else str(uuid.uuid4())
         logger.info(f"创建新游戏: {game_id}, 配置: {config.model_dump()}")
         
         # 创建玩家列表
@@ -112,12 +122,14 @@ async def create_game(config: GameConfig):
         # 创建游戏实例
         game = Game(game_id, players, config.initial_stack)
         
+        # AI配置只加载一次，以字典形式传给每个AI玩家
+        ai_config = load_config("llm")
+        
         # 初始化玩家位置和AI玩家实例
         for i, player_id in enumerate(players):
             game.state.add_player(player_id, config.initial_stack, i)
             if player_id.startswith("ai_"):
                 # 创建AI玩家实例
-                ai_config = load_config("config/llm.yml")
                 ai_player = LLMAgent(player_id, ai_config)
                 game.ai_players[player_id] = ai_player
                 logger.info(f"已创建AI玩家: {player_id}")
@@ -264,13 +276,10 @@ async def handle_action(game_id: str, action: PlayerAction):
                     detail=f"加注金额不能超过剩余筹码 {current_player.chips}"
                 )
         
-        # 创建游戏引擎动作对象
-        game_action = PlayerAction(
-            player_id=action.player_id,
-            action_type=action.action_type,
-            amount=action.amount,
-            timestamp=action.timestamp or datetime.now()
-        )
+        # 请求体已经是游戏引擎的动作对象，只需补充时间戳
+        if action.timestamp is None:
+            action.timestamp = datetime.now(timezone.utc)
+        game_action = action
         
         # 处理动作
         try:
@@ -434,9 +443,9 @@ async def websocket_endpoint(websocket: WebSocket, game_id: str):
                     # 创建动作对象
                     player_action = PlayerAction(
                         player_id="player_0",
-                        action_type=ActionType[action_type],
+                        action_type=ACTION_TYPES[action_type],
                         amount=amount,
-                        timestamp=datetime.now()
+                        timestamp=datetime.now(timezone.utc)
                     )
                     
                     # 处理动作
@@ -528,13 +537,17 @@ async def broadcast_game_state(game_id: str, state: GameState):
             data=state.model_dump()
         ).model_dump()
         
-        # 向所有连接的客户端发送更新
+        # 消息只序列化一次，再并发发送给所有连接的客户端
+        payload = orjson.dumps(message, default=str).decode()
+        websockets = list(active_connections.get(game_id, []))
+        results = await asyncio.gather(
+            *(websocket.send_text(payload) for websocket in websockets),
+            return_exceptions=True
+        )
         disconnected_clients = []
-        for websocket in active_connections.get(game_id, []):
-            try:
-                await websocket.send_json(message)
-            except Exception as e:
-                logger.error(f"发送状态更新失败: {e}")
+        for websocket, result in zip(websockets, results):
+            if isinstance(result, Exception):
+                logger.error(f"发送状态更新失败: {result}")
                 disconnected_clients.append(websocket)
                 
         # 清理断开的连接
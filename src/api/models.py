@@ -5,7 +5,7 @@ API数据模型定义。
 
 from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 
 from src.engine.game import ActionType
@@ -52,7 +52,7 @@ class PlayerAction(BaseModel):
     player_id: str = Field(..., description="玩家ID")
     action_type: str = Field(..., description="动作类型")
     amount: int = Field(0, description="动作金额")
-    timestamp: Optional[datetime] = Field(default_factory=datetime.now, description="动作时间戳")
+    timestamp: Optional[datetime] = Field(default_factory=lambda: datetime.now(timezone.utc), description="动作时间戳（UTC）")
 
 class ActionResult(BaseModel):
     """动作结果模型"""
@@ -5,7 +5,7 @@ WebSocket连接管理器。
 
 from fastapi import WebSocket, status
 from typing import Dict, Set, Optional
-import json
+import orjson
 import asyncio
 from datetime import datetime
 
@@ -22,8 +22,8 @@ class ConnectionManager:
         self.active_connections: Dict[str, Dict[str, WebSocket]] = {}
         # 存储每个游戏的玩家连接
         self.game_connections: Dict[str, Set[str]] = {}
-        # 存储ping任务
-        self.ping_tasks: Dict[str, asyncio.Task] = {}
+        # 所有游戏共享的ping任务
+        self.ping_task: Optional[asyncio.Task] = None
         self.ping_interval = config.websocket.ping_interval
         
         logger.info("WebSocket连接管理器已初始化")
@@ -60,11 +60,9 @@ class ConnectionManager:
             self.active_connections[game_id][player_id] = websocket
             self.game_connections[game_id].add(player_id)
             
-            # 启动ping任务
-            if game_id not in self.ping_tasks:
-                self.ping_tasks[game_id] = asyncio.create_task(
-                    self.start_ping(game_id)
-                )
+            # 启动共享的ping任务
+            if self.ping_task is None or self.ping_task.done():
+                self.ping_task = asyncio.create_task(self.start_ping())
             
             logger.info(f"玩家 {player_id} 加入游戏 {game_id}")
             
@@ -101,10 +99,6 @@ class ConnectionManager:
                 if not self.game_connections[game_id]:
                     del self.active_connections[game_id]
                     del self.game_connections[game_id]
-                    # 取消ping任务
-                    if game_id in self.ping_tasks:
-                        self.ping_tasks[game_id].cancel()
-                        del self.ping_tasks[game_id]
                     
             logger.info(f"玩家 {player_id} 离开游戏 {game_id}")
             
@@ -124,20 +118,24 @@ class ConnectionManager:
             
         # 转换消息为JSON字符串
         try:
-            json_message = json.dumps(message)
+            json_message = orjson.dumps(message).decode()
         except Exception as e:
             logger.error(f"消息序列化失败: {e}")
             return
             
-        # 广播消息
+        # 广播消息，消息只序列化一次，各连接并发发送
+        connections = list(self.active_connections[game_id].items())
+        results = await asyncio.gather(
+            *(connection.send_text(json_message) for _, connection in connections),
+            return_exceptions=True
+        )
         disconnected_players = []
-        for player_id, connection in self.active_connections[game_id].items():
-            try:
-                await connection.send_text(json_message)
-                logger.debug(f"向玩家 {player_id} 发送消息: {message['type']}")
-            except Exception as e:
-                logger.error(f"向玩家 {player_id} 发送消息失败: {e}")
+        for (player_id, _), result in zip(connections, results):
+            if isinstance(result, Exception):
+                logger.error(f"向玩家 {player_id} 发送消息失败: {result}")
                 disconnected_players.append(player_id)
+            else:
+                logger.debug(f"向玩家 {player_id} 发送消息: {message['type']}")
                 
         # 清理断开的连接
         for player_id in disconnected_players:
@@ -158,7 +156,7 @@ class ConnectionManager:
             
         try:
             # 转换消息为JSON字符串
-            json_message = json.dumps(message)
+            json_message = orjson.dumps(message).decode()
             
             # 发送消息
             await self.active_connections[game_id][player_id].send_text(json_message)
@@ -182,10 +180,10 @@ class ConnectionManager:
         
     async def close_all(self) -> None:
         """关闭所有连接"""
-        # 取消所有ping任务
-        for task in self.ping_tasks.values():
-            task.cancel()
-        self.ping_tasks.clear()
+        # 取消ping任务
+        if self.ping_task is not None:
+            self.ping_task.cancel()
+            self.ping_task = None
         
         # 关闭所有连接
         for game_id in list(self.active_connections.keys()):
@@ -210,26 +208,25 @@ class ConnectionManager:
         }
         await self.broadcast(game_id, ping_message)
         
-    async def start_ping(self, game_id: str, interval: int =5) -> None:
+    async def start_ping(self) -> None:
         """
-        开始定期ping
-        
-        Args:
-            game_id: 游戏ID
-            interval: ping间隔（秒）
+        定期向所有游戏发送ping，所有游戏共用一个任务，
+        按固定节拍计算下一次截止时间，避免逐次sleep累积漂移
         """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
         try:
-            while game_id in self.active_connections:
-                await self.ping(game_id)
-                await asyncio.sleep(interval)
+            while self.active_connections:
+                await asyncio.gather(*(self.ping(game_id) for game_id in list(self.active_connections)))
+                deadline += self.ping_interval
+                await asyncio.sleep(max(0.0, deadline - loop.time()))
         except asyncio.CancelledError:
-            logger.info(f"Ping任务已取消: 游戏={game_id}")
+            logger.info("Ping任务已取消")
         except Exception as e:
-            logger.error(f"Ping任务异常: 游戏={game_id}, 错误={e}")
+            logger.error(f"Ping任务异常: {e}")
             
     def __del__(self):
         """析构函数，确保资源被正确清理"""
-        # 取消所有ping任务
-        for task in self.ping_tasks.values():
-            if not task.done():
-                task.cancel() 
\ No newline at end of file
+        # 取消ping任务
+        if self.ping_task is not None and not self.ping_task.done():
+            self.ping_task.cancel()
@@ -11,6 +11,7 @@ from sqlalchemy.pool import StaticPool
 from contextlib import contextmanager
 from typing import Generator
 
+from src.utils.config import YamlLoader
 from src.utils.logger import get_logger
 from .models import Base
 
@@ -45,7 +46,7 @@ class DatabaseManager:
         config_path = Path("config/game.yml")
         try:
             with open(config_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=YamlLoader)
                 return config.get('database', {})
         except Exception as e:
             logger.warning(f"Could not load database config: {e}")
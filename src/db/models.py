@@ -4,11 +4,42 @@
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON
+import json
+import msgspec
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.types import TypeDecorator
 
 Base = declarative_base()
 
+_msgpack_encoder = msgspec.msgpack.Encoder()
+_msgpack_decoder = msgspec.msgpack.Decoder()
+
+class MsgPack(TypeDecorator):
+    """
+    以MessagePack二进制存储的列，读写时与Python的list/dict互相转换。
+    改用MessagePack之前写入的行以JSON文本存储，读取时按JSON解析。
+    """
+    impl = LargeBinary
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        return None if value is None else _msgpack_encoder.encode(value)
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, str):
+            # 旧数据库中的JSON文本列
+            return json.loads(value)
+        return _msgpack_decoder.decode(value)
+    
+    def result_processor(self, dialect, coltype):
+        # 跳过LargeBinary自身的bytes()转换，旧行读出的str需要原样交给process_result_value
+        def process(value):
+            return self.process_result_value(value, dialect)
+        return process
+
 class Game(Base):
     """游戏表"""
     __tablename__ = 'games'
@@ -16,7 +47,7 @@ class Game(Base):
     game_id = Column(String, primary_key=True)
     start_time = Column(DateTime, default=datetime.utcnow)
     end_time = Column(DateTime)
-    players = Column(JSON)  # 玩家列表，JSON数组
+    players = Column(MsgPack)  # 玩家列表
     initial_stakes = Column(Integer)
     winner = Column(String)
     final_pot = Column(Integer)
@@ -28,7 +59,7 @@ class Round(Base):
     round_id = Column(String, primary_key=True)
     game_id = Column(String, ForeignKey('games.game_id'))
     round_type = Column(String)  # PRE_FLOP, FLOP, TURN, RIVER
-    community_cards = Column(JSON)  # 公共牌，JSON数组
+    community_cards = Column(MsgPack)  # 公共牌列表
     pot_size = Column(Integer)
 
 class Action(Base):
@@ -41,8 +72,8 @@ class Action(Base):
     action_type = Column(String)
     amount = Column(Integer)
     timestamp = Column(DateTime, default=datetime.utcnow)
-    hand_cards = Column(JSON)  # 玩家手牌，JSON数组
-    reasoning = Column(JSON)  # AI决策理由，JSON对象
+    hand_cards = Column(MsgPack)  # 玩家手牌列表
+    reasoning = Column(MsgPack)  # AI决策理由
 
 class PlayerStats(Base):
     """玩家统计表"""
@@ -52,5 +83,5 @@ class PlayerStats(Base):
     games_played = Column(Integer, default=0)
     wins = Column(Integer, default=0)
     total_profit = Column(Integer, default=0)
-    play_style = Column(JSON)  # 玩家风格分析，JSON对象
+    play_style = Column(MsgPack)  # 玩家风格分析
     last_updated = Column(DateTime, default=datetime.utcnow) 
\ No newline at end of file
@@ -3,19 +3,22 @@
 提供德州扑克游戏的核心逻辑实现。
 """
 
-from src.engine.game import TexasHoldemGame, ActionType, PlayerAction
+from src.engine.game import TexasHoldemGame, ActionType, ACTION_TYPES, PlayerAction
 from src.engine.state import GameState, PlayerState, GameStage
 from src.engine.rules import HandEvaluator, HandResult
-from src.engine.dealer import Dealer
+from src.engine.dealer import Dealer, CARD_STRS, CARD_INDEX
 
 __all__ = [
     'TexasHoldemGame',
     'GameStage',
     'ActionType',
+    'ACTION_TYPES',
     'PlayerAction',
     'GameState',
     'PlayerState',
     'HandEvaluator',
     'HandResult',
-    'Dealer'
+    'Dealer',
+    'CARD_STRS',
+    'CARD_INDEX'
 ] 
\ No newline at end of file
@@ -4,7 +4,7 @@
 """
 
 import random
-from typing import List, Set, Tuple
+from typing import Dict, List, Set, Tuple
 from dataclasses import dataclass, field
 
 from src.utils.logger import get_logger
@@ -15,13 +15,18 @@ logger = get_logger(__name__)
 SUITS = ['♠', '♥', '♦', '♣']  # 黑桃、红心、方块、梅花
 RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
 
+# 52张牌的字符串只生成一次，下标即牌的编号
+CARD_STRS: Tuple[str, ...] = tuple(f"{rank}{suit}" for suit in SUITS for rank in RANKS)
+CARD_INDEX: Dict[str, int] = {card: i for i, card in enumerate(CARD_STRS)}
+
 @dataclass
 class Dealer:
     """发牌员类，负责管理和发放扑克牌"""
     
     deck: List[str] = field(default_factory=list)  # 牌堆
-    dealt_cards: Set[str] = field(default_factory=set)  # 已发出的牌
+    dealt_mask: int = 0  # 已发出的牌，第i位对应CARD_STRS[i]
     burnt_cards: List[str] = field(default_factory=list)  # 烧牌
+    used_mask: int = 0  # 已离开牌堆的牌（发出或烧掉），第i位对应CARD_STRS[i]
     community_cards: List[str] = field(default_factory=list)  # 公共牌
     
     def __post_init__(self):
@@ -31,15 +36,17 @@ class Dealer:
         
     def reset_deck(self):
         """重置牌堆到初始状态"""
-        self.deck = [f"{rank}{suit}" for suit in SUITS for rank in RANKS]
-        self.dealt_cards.clear()
+        # 原地复用同一个牌堆列表，牌字符串直接引用CARD_STRS，不再重新分配
+        self.deck[:] = CARD_STRS
+        self.dealt_mask = 0
         self.burnt_cards.clear()
+        self.used_mask = 0
         self.community_cards.clear()
         self.shuffle()
         self.logger.info("Deck has been reset and shuffled")
         
     def shuffle(self):
-        """洗牌"""
+        """洗牌（原地Fisher-Yates）"""
         random.shuffle(self.deck)
         self.logger.debug("Deck has been shuffled")
         
@@ -56,6 +63,7 @@ class Dealer:
             
         card = self.deck.pop()
         self.burnt_cards.append(card)
+        self.used_mask |= 1 << CARD_INDEX[card]
         self.logger.debug(f"Burned card: {card}")
         return card
         
@@ -71,10 +79,44 @@ class Dealer:
             raise ValueError("No cards left to deal")
             
         card = self.deck.pop()
-        self.dealt_cards.add(card)
+        bit = 1 << CARD_INDEX[card]
+        self.dealt_mask |= bit
+        self.used_mask |= bit
         self.logger.debug(f"Dealt card: {card}")
         return card
         
+    def _take(self, count: int, burn: bool = False) -> List[str]:
+        """
+        从牌堆顶部一次取出多张牌并记录为已发出
+        
+        Args:
+            count: 要取的牌数量
+            burn: 是否先烧掉顶部一张牌（与发出的牌在同一次切片中取出）
+            
+        Returns:
+            List[str]: 按发牌顺序排列的牌，不含烧牌
+        """
+        need = count + burn
+        if need > len(self.deck):
+            self.logger.error("No cards left to deal")
+            raise ValueError("No cards left to deal")
+            
+        cards = self.deck[-need:] if need else []
+        del self.deck[len(self.deck) - need:]
+        cards.reverse()
+        if burn:
+            burnt = cards.pop(0)
+            self.burnt_cards.append(burnt)
+            self.used_mask |= 1 << CARD_INDEX[burnt]
+            self.logger.debug(f"Burned card: {burnt}")
+        mask = self.dealt_mask
+        for card in cards:
+            mask |= 1 << CARD_INDEX[card]
+        self.used_mask |= mask ^ self.dealt_mask
+        self.dealt_mask = mask
+        self.logger.debug(f"Dealt cards: {cards}")
+        return cards
+        
     def deal_hole_cards(self, num_players: int) -> List[Tuple[str, str]]:
         """
         发手牌给多个玩家
@@ -89,10 +131,9 @@ class Dealer:
             self.logger.error(f"Not enough cards for {num_players} players")
             raise ValueError(f"Not enough cards for {num_players} players")
             
-        hole_cards = []
-        for _ in range(num_players):
-            player_cards = (self.deal_card(), self.deal_card())
-            hole_cards.append(player_cards)
+        # 一次切出所有手牌，发牌顺序与逐张从牌堆顶部取牌一致
+        cards = self._take(num_players * 2)
+        hole_cards = list(zip(cards[0::2], cards[1::2]))
             
         self.logger.info(f"Dealt hole cards to {num_players} players")
         return hole_cards
@@ -111,15 +152,9 @@ class Dealer:
             self.logger.error(f"Not enough cards to deal {count} community cards")
             raise ValueError(f"Not enough cards to deal {count} community cards")
             
-        # 先烧一张牌
-        self.burn_card()
-        
-        # 发指定数量的公共牌
-        cards = []
-        for _ in range(count):
-            card = self.deal_card()
-            cards.append(card)
-            self.community_cards.append(card)
+        # 先烧一张牌，再发指定数量的公共牌，一次切片完成
+        cards = self._take(count, burn=True)
+        self.community_cards.extend(cards)
             
         self.logger.info(f"Dealt {count} community cards: {cards}")
         return cards
@@ -167,7 +202,32 @@ class Dealer:
         Returns:
             Set[str]: 已发出的牌的集合
         """
-        return self.dealt_cards.copy()
+        mask = self.dealt_mask
+        return {card for i, card in enumerate(CARD_STRS) if mask >> i & 1}
+        
+    def is_dealt(self, card: str) -> bool:
+        """
+        判断一张牌是否已经发出
+        
+        Args:
+            card: 牌
+            
+        Returns:
+            bool: 是否已发出
+        """
+        return bool(self.dealt_mask >> CARD_INDEX[card] & 1)
+        
+    def is_remaining(self, card: str) -> bool:
+        """
+        判断一张牌是否仍在牌堆中
+        
+        Args:
+            card: 牌
+            
+        Returns:
+            bool: 是否仍在牌堆中
+        """
+        return not self.used_mask >> CARD_INDEX[card] & 1
         
     def get_burnt_cards(self) -> List[str]:
         """
@@ -3,19 +3,20 @@
 负责德州扑克游戏的核心流程控制，包括状态管理、回合控制和动作验证。
 """
 
-from enum import Enum, auto
+import logging
+from enum import auto
 from typing import List, Dict, Optional, Tuple, Any
 from dataclasses import dataclass
 from datetime import datetime
 
-from src.engine.state import GameState, PlayerState, GameStage
+from src.engine.state import GameState, PlayerState, GameStage, NamedIntEnum
 from src.engine.dealer import Dealer
-from src.engine.rules import HandEvaluator, HandResult
+from src.engine.rules import HandEvaluator, HandResult, HandRank
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-class ActionType(Enum):
+class ActionType(NamedIntEnum):
     """玩家动作类型"""
     FOLD = auto()          # 弃牌
     CHECK = auto()         # 过牌
@@ -23,6 +24,9 @@ class ActionType(Enum):
     RAISE = auto()         # 加注
     ALL_IN = auto()        # 全下
 
+# 动作名称到动作类型的映射，解析客户端和LLM传来的字符串时直接查表
+ACTION_TYPES: Dict[str, ActionType] = dict(ActionType.__members__)
+
 @dataclass
 class PlayerAction:
     """玩家动作数据类"""
@@ -138,38 +142,43 @@ class TexasHoldemGame:
         logger.info(f"游戏 {self.game_id} 开始，进入翻牌前阶段")
         
         # 设置第一个行动玩家（大盲注后一位）
-        max_position = max(p.position for p in active_players)
-        sb_position = (self.button_position + 1) % (max_position + 1)
-        bb_position = (self.button_position + 2) % (max_position + 1)
-        first_position = (bb_position + 1) % (max_position + 1)
+        _, bb_position, first_position = self._blind_positions(active_players)
         
         # 找到对应位置的玩家
         first_player = next((p for p in active_players if p.position == first_position), None)
         
-        # 如果找不到玩家（可能是因为位置上没有玩家）,则找到第一个可用的位置
+        # 如果找不到玩家（可能是因为位置上没有玩家）,则找到第一个大于大盲注位置的玩家（活跃玩家已按位置排序）
         if not first_player:
-            # 按位置排序，找到第一个大于大盲注位置的玩家
-            sorted_players = sorted(active_players, key=lambda p: p.position)
-            
-            for player in sorted_players:
-                if player.position > bb_position:
-                    first_player = player
-                    break
+            first_player = next((p for p in active_players if p.position > bb_position), None)
                     
             # 如果还是找不到，使用第一个玩家
-            if not first_player and sorted_players:
-                first_player = sorted_players[0]
+            if not first_player and active_players:
+                first_player = active_players[0]
         
         # 设置当前玩家
         if first_player:
             self.state.current_player = first_player.id
-            sorted_players = sorted(active_players, key=lambda p: p.position)
-            self.current_player_idx = sorted_players.index(first_player)
+            self.current_player_idx = active_players.index(first_player)
             logger.info(f"第一个行动玩家: {first_player.id}, 位置: {first_player.position}")
         else:
             logger.warning("无法确定第一个行动玩家")
             self.state.current_player = None
     
+    def _blind_positions(self, active_players: List[PlayerState]) -> Tuple[int, int, int]:
+        """
+        计算本局小盲注、大盲注和翻牌前第一个行动玩家的位置
+        
+        Args:
+            active_players: 按位置排序的活跃玩家
+            
+        Returns:
+            Tuple[int, int, int]: (小盲注位置, 大盲注位置, 第一个行动位置)，座位数按最大位置加一轮转
+        """
+        seats = active_players[-1].position + 1
+        sb_position = (self.button_position + 1) % seats
+        bb_position = (sb_position + 1) % seats
+        return sb_position, bb_position, (bb_position + 1) % seats
+    
     def post_blinds(self) -> None:
         """收取盲注"""
         active_players = self.state.get_active_players()
@@ -177,9 +186,7 @@ class TexasHoldemGame:
             raise ValueError("玩家数量不足")
             
         # 找到小盲注位置（庄家位置的下一个位置）
-        max_position = max(p.position for p in active_players)
-        sb_position = (self.button_position + 1) % (max_position + 1)
-        bb_position = (self.button_position + 2) % (max_position + 1)
+        sb_position, bb_position, next_position = self._blind_positions(active_players)
         
         # 找到对应位置的玩家
         sb_player = next((p for p in active_players if p.position == sb_position), None)
@@ -199,7 +206,6 @@ class TexasHoldemGame:
         self.min_raise = self.big_blind  # 设置最小加注额为大盲注
         
         # 设置当前玩家为大盲注后一位
-        next_position = (bb_position + 1) % (max_position + 1)
         current_player = next((p for p in active_players if p.position == next_position), None)
         if current_player:
             self.current_player_idx = active_players.index(current_player)
@@ -218,16 +224,15 @@ class TexasHoldemGame:
         if not self.state.current_player:
             return None
         
-        # 查找当前玩家
+        # 直接通过ID获取当前玩家，确保使用正确的玩家
+        player = self.state.players.get(self.state.current_player)
+        if player is not None and player.is_active:
+            return player
+        
         active_players = self.state.get_active_players()
         if not active_players:
             logger.info("没有活跃玩家")
             return None
-        
-        # 直接通过ID获取当前玩家，确保使用正确的玩家
-        for player in active_players:
-            if player.id == self.state.current_player:
-                return player
             
         # 如果找不到当前玩家（可能是因为已经弃牌），则从active_players列表中选择第一个
         logger.warning(f"当前玩家 {self.state.current_player} 不在活跃列表中，使用第一个活跃玩家替代")
@@ -251,22 +256,22 @@ class TexasHoldemGame:
             logger.info("没有活跃玩家，回合完成")
             return True
         
-        # 获取当前最大下注额
-        max_bet = self.state.get_max_bet()
+        # 获取当前最大下注额（直接使用已取得的活跃玩家，避免再次过滤）
+        max_bet = max(p.current_bet for p in active_players)
         logger.info(f"当前最大下注额: {max_bet}")
         
-        # 记录所有活跃玩家的状态
+        # 记录所有活跃玩家的状态（已全下的玩家不能再行动，直接跳过）
         all_acted = True
         all_bets_equal = True
+        debug = logger.isEnabledFor(logging.DEBUG)
         
         for player in active_players:
-            logger.info(f"检查玩家 {player.id}: has_acted={player.has_acted}, current_bet={player.current_bet}, is_all_in={player.is_all_in}")
-            
-            # 跳过已全下的玩家，他们不能再行动
             if player.is_all_in:
-                logger.debug(f"玩家 {player.id} 已全下，无需检查")
                 continue
             
+            if debug:
+                logger.debug(f"检查玩家 {player.id}: has_acted={player.has_acted}, current_bet={player.current_bet}")
+            
             # 检查是否所有玩家都已行动
             if not player.has_acted:
                 logger.info(f"玩家 {player.id} 未行动，回合继续")
@@ -403,13 +408,14 @@ class TexasHoldemGame:
             return None
         
         # 获取当前最大下注额
-        max_bet = self.state.get_max_bet()
+        max_bet = max(p.current_bet for p in active_players)
         logger.info(f"当前最大下注额: {max_bet}")
         
+        # 活跃玩家列表已按位置排序
+        sorted_players = active_players
+        
         # 如果当前没有玩家，则从庄家后第一个开始
         if not self.state.current_player:
-            # 按位置排序
-            sorted_players = sorted(active_players, key=lambda p: p.position)
             # 找到庄家后第一个活跃玩家
             dealer_position = self.state.dealer_position
             
@@ -423,24 +429,13 @@ class TexasHoldemGame:
             logger.info(f"庄家位置 {dealer_position} 后没有玩家，从头开始: {sorted_players[0].id}")
             return sorted_players[0]
         
-        # 获取所有玩家（包括弃牌的）
-        all_players = list(self.state.players.values())
-        
         # 找到当前玩家，即使已经弃牌
-        current_player = None
-        for player in all_players:
-            if player.id == self.state.current_player:
-                current_player = player
-                break
+        current_player = self.state.players.get(self.state.current_player)
         
         if not current_player:
             logger.warning(f"找不到当前玩家: {self.state.current_player}")
             return active_players[0]
         
-        # 根据位置排序所有活跃玩家
-        sorted_players = sorted(active_players, key=lambda p: p.position)
-        logger.debug(f"排序后的活跃玩家: {[(p.id, p.position) for p in sorted_players]}")
-        
         # 找到当前玩家之后的第一个活跃玩家
         found_next = False
         for player in sorted_players:
@@ -604,7 +599,7 @@ class TexasHoldemGame:
             action_type = action.action_type
         else:
             # 如果是字符串，则转换为ActionType
-            action_type = ActionType[str(action.action_type).upper()]
+            action_type = ACTION_TYPES[str(action.action_type).upper()]
             
         # 获取当前最大下注
         max_bet = self.state.get_max_bet()
@@ -637,6 +632,20 @@ class TexasHoldemGame:
             if action.amount > player.chips:
                 raise ValueError("筹码不足，可以选择全下")
     
+    def get_raise_bounds(self, player_id: str) -> Tuple[int, int]:
+        """
+        计算玩家本次可以加注到的金额范围，供服务端下发给前端
+        
+        Args:
+            player_id: 玩家ID
+            
+        Returns:
+            Tuple[int, int]: (最小加注额, 最大加注额)；最小加注为当前最大注的两倍且不低于两个大盲注，最大加注为玩家筹码
+        """
+        min_raise_to = max(self.state.get_max_bet() * 2, self.big_blind * 2)
+        player = self.state.players.get(player_id)
+        return min_raise_to, player.chips if player else 0
+    
     def _end_game(self) -> None:
         """结束游戏并结算"""
         try:
@@ -670,34 +679,30 @@ class TexasHoldemGame:
                 })
                 
             else:
-                # 比较手牌
-                results = []
-                for player in active_players:
-                    try:
-                        # 确保卡牌格式正确
-                        player_cards = player.cards
-                        community_cards = self.state.community_cards
-                        
-                        hand_result = HandEvaluator.evaluate_hand(
-                            player_cards,
-                            community_cards
-                        )
-                        results.append((player, hand_result))
-                        # 添加玩家摊牌数据
-                        showdown_data.append({
-                            "player_id": player.id,
-                            "hole_cards": player_cards,  # 直接使用cards，不需要转换
-                            "hand_rank": hand_result.rank.name,
-                            "is_winner": False  # 稍后更新获胜者
-                        })
-                    except Exception as e:
-                        logger.error(f"评估玩家 {player.id} 手牌时出错: {str(e)}")
-                        raise
+                # 比较手牌：一次计算所有玩家的整数分值，分值最大者获胜
+                try:
+                    scores = HandEvaluator.score_showdown(
+                        [player.cards for player in active_players],
+                        self.state.community_cards
+                    )
+                except Exception as e:
+                    logger.error(f"评估玩家手牌时出错: {str(e)}")
+                    raise
+                    
+                best_score = -1
+                for player, score in zip(active_players, scores):
+                    if score > best_score:
+                        best_score = score
+                        winner = player
+                    # 添加玩家摊牌数据
+                    showdown_data.append({
+                        "player_id": player.id,
+                        "hole_cards": player.cards,  # 直接使用cards，不需要转换
+                        "hand_rank": HandEvaluator.rank_of_score(score).name,
+                        "is_winner": False  # 稍后更新获胜者
+                    })
                 
-                # 按手牌大小排序
-                results.sort(key=lambda x: x[1], reverse=True)
-                winner = results[0][0]
-                winning_hand = results[0][1]
+                winning_hand = HandEvaluator.rank_of_score(best_score)
                 pot_amount = self.state.pot
                 
                 # 更新获胜者标记
@@ -712,7 +717,7 @@ class TexasHoldemGame:
             self.state.game_result = {
                 "winner_id": winner.id,
                 "pot_amount": pot_amount,
-                "winning_hand": winning_hand.rank.name if winning_hand else None,  # 处理 winning_hand 可能为 None 的情况
+                "winning_hand": winning_hand.name if winning_hand else None,  # 处理 winning_hand 可能为 None 的情况
                 "community_cards": self.state.community_cards,  # 直接使用community_cards，不需要转换
                 "showdown_data": showdown_data  # 添加摊牌数据
             }
@@ -4,10 +4,11 @@
 """
 
 from enum import Enum, auto
-from typing import List, Tuple, Set
+from typing import List, Tuple, Set, Union
 from dataclasses import dataclass
 from collections import Counter
 
+from src.engine.dealer import CARD_INDEX
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -28,6 +29,8 @@ class HandRank(Enum):
 @dataclass
 class HandResult:
     """手牌结果类，用于存储牌型判断结果"""
+    __slots__ = ("rank", "hand_cards", "community_cards", "best_five", "kickers")
+    
     rank: HandRank                # 牌型
     hand_cards: List[str]         # 手牌
     community_cards: List[str]    # 公共牌
@@ -79,6 +82,56 @@ class HandResult:
         """大于等于比较"""
         return not (self < other)
 
+# 摊牌用的整数编码: 每张牌对应(点数下标0-12, 花色下标0-3)
+# 同时支持字符串"A♠"和发牌系统的整数编号(CARD_INDEX)，整数编号无需解析字符串
+_RANK_INDEX = {
+    '2': 0, '3': 1, '4': 2, '5': 3, '6': 4, '7': 5, '8': 6,
+    '9': 7, '10': 8, 'J': 9, 'Q': 10, 'K': 11, 'A': 12
+}
+_SUIT_INDEX = {'♠': 0, '♥': 1, '♦': 2, '♣': 3}
+_CARD_CODES = {
+    f"{rank}{suit}": (r, s)
+    for rank, r in _RANK_INDEX.items()
+    for suit, s in _SUIT_INDEX.items()
+}
+_CARD_CODES.update({CARD_INDEX[card]: code for card, code in list(_CARD_CODES.items())})
+
+# 牌可以是字符串或整数编号
+Card = Union[str, int]
+
+# 点数位掩码中连续五位的掩码 -> 顺子最大牌的点数下标，A可以作为1组成5-4-3-2-A
+_STRAIGHTS = [(0b11111 << low, low + 4) for low in range(8, -1, -1)] + [(0b1000000001111, 3)]
+
+def _straight_high(mask: int) -> int:
+    """返回点数位掩码中最大顺子的最大牌点数下标，没有顺子返回-1"""
+    for bits, high in _STRAIGHTS:
+        if mask & bits == bits:
+            return high
+    return -1
+
+def _top_ranks(mask: int, count: int) -> List[int]:
+    """从点数位掩码中按从大到小取出count个点数下标"""
+    ranks = []
+    while mask and len(ranks) < count:
+        high = mask.bit_length() - 1
+        ranks.append(high)
+        mask &= ~(1 << high)
+    return ranks
+
+def _pack(rank: 'HandRank', ranks: List[int]) -> int:
+    """把牌型和最多五个比较用的点数下标打包成一个整数，整数越大牌越大"""
+    score = rank.value
+    for i in range(5):
+        score = (score << 4) | (ranks[i] if i < len(ranks) else 0)
+    return score
+
+# 每张牌到点数数值的映射（2-14），避免每次切片字符串再查表
+_CARD_RANK_VALUES = {
+    f"{rank}{suit}": r + 2
+    for rank, r in _RANK_INDEX.items()
+    for suit in _SUIT_INDEX
+}
+
 class HandEvaluator:
     """手牌评估器，负责判断牌型和比较大小"""
     
@@ -91,7 +144,7 @@ class HandEvaluator:
     @staticmethod
     def get_rank_value(card: str) -> int:
         """获取牌面点数的数值"""
-        return HandEvaluator.RANK_VALUES[card[:-1]]
+        return _CARD_RANK_VALUES[card]
     
     @staticmethod
     def get_suit(card: str) -> str:
@@ -370,6 +423,129 @@ class HandEvaluator:
             
         return None
     
+    @staticmethod
+    def score_hand(cards: List[Card]) -> int:
+        """
+        计算5到7张牌中最佳五张牌组合的整数分值，用于摊牌比较。
+        只使用点数和花色的位掩码运算，不构造HandResult，也不对牌排序。
+        
+        Args:
+            cards: 手牌和公共牌，字符串或整数编号
+            
+        Returns:
+            int: 分值，越大牌越大，相同表示平局；高位为牌型，低位依次为比较用的点数
+        """
+        suit_masks = [0, 0, 0, 0]
+        counts = [0] * 13
+        for card in cards:
+            r, s = _CARD_CODES[card]
+            suit_masks[s] |= 1 << r
+            counts[r] += 1
+        return HandEvaluator._score_masks(suit_masks, counts)
+    
+    @staticmethod
+    def score_showdown(hole_cards: List[List[Card]], community_cards: List[Card]) -> List[int]:
+        """
+        批量计算多位玩家的分值，公共牌只统计一次，每位玩家只需再加入两张手牌
+        
+        Args:
+            hole_cards: 每位玩家的手牌，字符串或整数编号
+            community_cards: 公共牌，字符串或整数编号
+            
+        Returns:
+            List[int]: 与hole_cards顺序对应的score_hand分值
+        """
+        board_suits = [0, 0, 0, 0]
+        board_counts = [0] * 13
+        for card in community_cards:
+            r, s = _CARD_CODES[card]
+            board_suits[s] |= 1 << r
+            board_counts[r] += 1
+            
+        scores = []
+        for cards in hole_cards:
+            suit_masks = board_suits[:]
+            counts = board_counts[:]
+            for card in cards:
+                r, s = _CARD_CODES[card]
+                suit_masks[s] |= 1 << r
+                counts[r] += 1
+            scores.append(HandEvaluator._score_masks(suit_masks, counts))
+        return scores
+    
+    @staticmethod
+    def _score_masks(suit_masks: List[int], counts: List[int]) -> int:
+        """根据每种花色的点数位掩码和每个点数的张数计算分值"""
+        # 同花和同花顺（7张牌中最多只有一种花色能凑够5张）
+        flush_mask = 0
+        for mask in suit_masks:
+            if bin(mask).count("1") >= 5:
+                flush_mask = mask
+                break
+        if flush_mask:
+            high = _straight_high(flush_mask)
+            if high == 12:
+                return _pack(HandRank.ROYAL_FLUSH, [high])
+            if high >= 0:
+                return _pack(HandRank.STRAIGHT_FLUSH, [high])
+                
+        # 按张数分组，每组内点数从大到小
+        quads, trips, pairs = [], [], []
+        rank_mask = 0
+        for r in range(12, -1, -1):
+            count = counts[r]
+            if count:
+                rank_mask |= 1 << r
+                if count == 4:
+                    quads.append(r)
+                elif count == 3:
+                    trips.append(r)
+                elif count == 2:
+                    pairs.append(r)
+                    
+        if quads:
+            quad = quads[0]
+            return _pack(HandRank.FOUR_OF_A_KIND, [quad] + _top_ranks(rank_mask & ~(1 << quad), 1))
+            
+        if trips and (len(trips) > 1 or pairs):
+            pair = max(trips[1] if len(trips) > 1 else -1, pairs[0] if pairs else -1)
+            return _pack(HandRank.FULL_HOUSE, [trips[0], pair])
+            
+        if flush_mask:
+            return _pack(HandRank.FLUSH, _top_ranks(flush_mask, 5))
+            
+        high = _straight_high(rank_mask)
+        if high >= 0:
+            return _pack(HandRank.STRAIGHT, [high])
+            
+        if trips:
+            trip = trips[0]
+            return _pack(HandRank.THREE_OF_A_KIND, [trip] + _top_ranks(rank_mask & ~(1 << trip), 2))
+            
+        if len(pairs) >= 2:
+            high_pair, low_pair = pairs[0], pairs[1]
+            rest = rank_mask & ~(1 << high_pair) & ~(1 << low_pair)
+            return _pack(HandRank.TWO_PAIR, [high_pair, low_pair] + _top_ranks(rest, 1))
+            
+        if pairs:
+            pair = pairs[0]
+            return _pack(HandRank.PAIR, [pair] + _top_ranks(rank_mask & ~(1 << pair), 3))
+            
+        return _pack(HandRank.HIGH_CARD, _top_ranks(rank_mask, 5))
+    
+    @staticmethod
+    def rank_of_score(score: int) -> HandRank:
+        """
+        从score_hand的分值中取出牌型
+        
+        Args:
+            score: score_hand返回的分值
+            
+        Returns:
+            HandRank: 牌型
+        """
+        return HandRank(score >> 20)
+    
     @staticmethod
     def compare_hands(result1: HandResult, result2: HandResult) -> int:
         """
@@ -4,15 +4,24 @@
 """
 
 from typing import List, Dict, Optional, Any, Tuple
-from dataclasses import dataclass, field
-from enum import Enum, auto
+from enum import Enum, IntEnum, auto
 from datetime import datetime
+import logging
+import sys
 
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-class GameStage(Enum):
+class NamedIntEnum(IntEnum):
+    """按整数比较的枚举，打印和格式化时仍显示枚举名（如 GameStage.FLOP），保持日志可读"""
+    
+    __str__ = Enum.__str__
+    
+    def __format__(self, format_spec: str) -> str:
+        return format(str(self), format_spec)
+
+class GameStage(NamedIntEnum):
     """游戏阶段枚举"""
     WAITING = auto()    # 等待开始
     DEALING = auto()    # 发牌阶段
@@ -34,19 +43,34 @@ class PlayerAction(Enum):
     def __str__(self) -> str:
         return self.value
 
-@dataclass
 class PlayerState:
-    """玩家状态类"""
-    id: str                     # 玩家ID
-    chips: int                  # 当前筹码
-    cards: List[str] = field(default_factory=list)  # 手牌
-    current_bet: int = 0        # 当前下注
-    total_bet: int = 0         # 本局游戏总下注
-    has_acted: bool = False    # 是否已行动
-    is_active: bool = True     # 是否仍在游戏中
-    is_all_in: bool = False    # 是否全下
-    position: int = 0          # 玩家位置
-    model_name: Optional[str] = None  # 添加模型名称属性
+    """玩家状态类（使用__slots__，下注和轮转时属性访问频繁，不需要实例字典）"""
+    
+    __slots__ = ("id", "chips", "cards", "current_bet", "total_bet", "has_acted",
+                 "is_active", "is_all_in", "position", "model_name")
+    
+    def __init__(self, id: str, chips: int, cards: Optional[List[str]] = None, current_bet: int = 0,
+                 total_bet: int = 0, has_acted: bool = False, is_active: bool = True,
+                 is_all_in: bool = False, position: int = 0, model_name: Optional[str] = None):
+        self.id = id                      # 玩家ID
+        self.chips = chips                # 当前筹码
+        self.cards = cards if cards is not None else []  # 手牌
+        self.current_bet = current_bet    # 当前下注
+        self.total_bet = total_bet        # 本局游戏总下注
+        self.has_acted = has_acted        # 是否已行动
+        self.is_active = is_active        # 是否仍在游戏中
+        self.is_all_in = is_all_in        # 是否全下
+        self.position = position          # 玩家位置
+        self.model_name = model_name      # 模型名称
+    
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PlayerState):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+    
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"PlayerState({fields})"
 
 class GameState:
     """游戏状态类"""
@@ -55,6 +79,8 @@ class GameState:
         """初始化游戏状态"""
         self.game_id: str = ""  # 添加game_id属性
         self.players: Dict[str, PlayerState] = {}
+        self.players_list: List[PlayerState] = []  # 与players同步的玩家列表，按加入顺序排列
+        self.players_by_position: List[PlayerState] = []  # 同一批玩家，按位置排序（位置加入后不再改变）
         self.active_players: List[PlayerState] = []
         self.pot: int = 0
         self.initial_chips: int = 1000
@@ -73,6 +99,12 @@ class GameState:
         
     def add_player(self, player_id: str, chips: int, position: int = None) -> None:
         """添加玩家到游戏"""
+        # 驻留玩家ID，之后各处按ID查字典时可直接命中同一个字符串对象
+        player_id = sys.intern(player_id)
+        if player_id in self.players:
+            logger.warning(f"玩家 {player_id} 已存在，忽略重复添加")
+            return
+            
         if position is None:
             # 自动分配下一个可用位置
             used_positions = {p.position for p in self.players.values()}
@@ -82,6 +114,12 @@ class GameState:
             
         player = PlayerState(player_id, chips, position=position)
         self.players[player_id] = player
+        self.players_list.append(player)
+        # 插入到相同位置的玩家之后，与按位置稳定排序的结果一致
+        index = len(self.players_by_position)
+        while index > 0 and self.players_by_position[index - 1].position > position:
+            index -= 1
+        self.players_by_position.insert(index, player)
         self.active_players.append(player)
         logger.info(f"Added player {player_id} with {chips} chips at position {position}")
         
@@ -92,12 +130,11 @@ class GameState:
         Returns:
             List[PlayerState]: 按照行动顺序排序的活跃玩家列表
         """
-        active_players = [p for p in self.players.values() if p.is_active]
+        # players_by_position已按位置排好序，只需过滤
+        active_players = [p for p in self.players_by_position if p.is_active]
         
-        # 按照位置排序
-        active_players.sort(key=lambda p: p.position)
-        
-        logger.debug(f"当前活跃玩家顺序: {[p.id for p in active_players]}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"当前活跃玩家顺序: {[p.id for p in active_players]}")
         return active_players
         
     def fold_player(self, player_id: str) -> None:
@@ -117,11 +154,6 @@ class GameState:
         
         logger.info(f"玩家 {player_id} 弃牌")
         
-        # 检查是否只剩一个活跃玩家
-        active_players = self.get_active_players()
-        if len(active_players) == 1:
-            logger.info(f"只剩一个活跃玩家: {active_players[0].id}")
-        
     def call(self, player_id: str) -> None:
         """
         玩家跟注
@@ -141,17 +173,23 @@ class GameState:
         
         # 实际可跟注金额不能超过玩家剩余筹码
         actual_amount = min(call_amount, player.chips)
+        self._commit_bet(player, actual_amount)
         
-        # 更新玩家状态
-        player.current_bet += actual_amount
-        player.chips -= actual_amount
-        player.total_bet += actual_amount  # 更新总下注
-        self.pot += actual_amount  # 将跟注金额加入底池
+        logger.info(f"玩家 {player_id} 跟注 {actual_amount} 筹码，已标记为已行动")
         
-        # 标记玩家已行动
-        player.has_acted = True
+    def _commit_bet(self, player: PlayerState, amount: int) -> None:
+        """
+        把玩家的筹码移入底池，并标记玩家已行动
         
-        logger.info(f"玩家 {player_id} 跟注 {actual_amount} 筹码，已标记为已行动")
+        Args:
+            player: 玩家状态
+            amount: 本次投入的筹码
+        """
+        player.chips -= amount
+        player.current_bet += amount
+        player.total_bet += amount
+        player.has_acted = True
+        self.pot += amount
         
     def raise_bet(self, player_id: str, amount: int) -> None:
         """
@@ -171,15 +209,7 @@ class GameState:
         if total_amount > player.chips + player.current_bet:
             raise ValueError("筹码不足")
             
-        # 更新玩家状态
-        actual_amount = total_amount - player.current_bet
-        player.chips -= actual_amount
-        player.current_bet = total_amount
-        player.total_bet += actual_amount  # 更新总下注
-        self.pot += actual_amount  # 将加注金额加入底池
-        
-        # 标记玩家已行动
-        player.has_acted = True
+        self._commit_bet(player, total_amount - player.current_bet)
         
         logger.info(f"玩家 {player_id} 加注到 {total_amount} 筹码，已标记为已行动")
         
@@ -193,18 +223,9 @@ class GameState:
         player = self.players[player_id]
         amount = player.chips
         
-        # 更新玩家状态
-        player.chips = 0
-        player.current_bet += amount
-        player.total_bet += amount  # 更新总下注
+        self._commit_bet(player, amount)
         player.is_all_in = True
         
-        # 标记玩家已行动
-        player.has_acted = True
-        
-        # 更新底池
-        self.pot += amount
-        
         # 如果全下金额大于当前最大注，更新最小加注额
         if player.current_bet > self.min_raise:
             self.min_raise = player.current_bet
@@ -269,7 +290,8 @@ class GameState:
         if player_id not in self.players:
             raise ValueError(f"Player {player_id} not found")
             
-        self.players[player_id].cards = cards
+        # 统一存为列表，序列化时可直接使用而无需再次转换
+        self.players[player_id].cards = list(cards)
         logger.debug(f"Set cards for player {player_id}")
     
     def bet(self, player_id: str, amount: int) -> None:
@@ -322,42 +344,10 @@ class GameState:
             current_max_bet = self.get_max_bet()
             logger.info(f"当前最大下注: {current_max_bet}")
             
-            if action == PlayerAction.FOLD:
-                logger.info(f"玩家 {player_id} 选择弃牌")
-                self.fold_player(player_id)
-            elif action == PlayerAction.CHECK:
-                # 只有当前下注等于最大下注时才能过牌
-                if current_max_bet > player.current_bet:
-                    logger.warning(f"玩家 {player_id} 无法过牌，当前最大下注 {current_max_bet} 大于玩家下注 {player.current_bet}")
-                    return False
-                logger.info(f"玩家 {player_id} 选择过牌")
-            elif action == PlayerAction.CALL:
-                # 跟注时需要有足够的筹码
-                call_amount = current_max_bet - player.current_bet
-                if call_amount > player.chips:
-                    logger.warning(f"玩家 {player_id} 筹码不足以跟注，需要 {call_amount} 筹码但只有 {player.chips}")
-                    return False
-                logger.info(f"玩家 {player_id} 跟注 {call_amount} 筹码")
-                self.call(player_id)
-            elif action == PlayerAction.RAISE:
-                # 加注金额必须大于当前最大下注
-                if amount <= current_max_bet:
-                    logger.warning(f"玩家 {player_id} 加注金额 {amount} 不能小于等于当前最大下注 {current_max_bet}")
-                    return False
-                # 加注金额必须大于最小加注
-                if amount - current_max_bet < self.min_raise:
-                    logger.warning(f"玩家 {player_id} 加注金额 {amount} 小于最小加注 {self.min_raise}")
-                    return False
-                # 加注金额必须在玩家筹码范围内
-                raise_amount = amount - player.current_bet
-                if raise_amount > player.chips:
-                    logger.warning(f"玩家 {player_id} 筹码不足以加注，需要 {raise_amount} 筹码但只有 {player.chips}")
-                    return False
-                logger.info(f"玩家 {player_id} 加注到 {amount} 筹码")
-                self.raise_bet(player_id, amount)
-            elif action == PlayerAction.ALL_IN:
-                logger.info(f"玩家 {player_id} 选择全下 {player.chips} 筹码")
-                self.all_in(player_id)
+            # 按动作类型查表分派到对应的处理方法
+            handler = self._ACTION_HANDLERS.get(action)
+            if handler is not None and not handler(self, player, current_max_bet, amount):
+                return False
                 
             player.has_acted = True
             logger.info(f"玩家 {player_id} 动作已完成")
@@ -367,6 +357,64 @@ class GameState:
             logger.error(f"处理玩家 {player_id} 动作时出错: {str(e)}")
             return False
     
+    def _apply_fold(self, player: PlayerState, current_max_bet: int, amount: int) -> bool:
+        """弃牌"""
+        logger.info(f"玩家 {player.id} 选择弃牌")
+        self.fold_player(player.id)
+        return True
+    
+    def _apply_check(self, player: PlayerState, current_max_bet: int, amount: int) -> bool:
+        """过牌，只有当前下注等于最大下注时才能过牌"""
+        if current_max_bet > player.current_bet:
+            logger.warning(f"玩家 {player.id} 无法过牌，当前最大下注 {current_max_bet} 大于玩家下注 {player.current_bet}")
+            return False
+        logger.info(f"玩家 {player.id} 选择过牌")
+        return True
+    
+    def _apply_call(self, player: PlayerState, current_max_bet: int, amount: int) -> bool:
+        """跟注，需要有足够的筹码"""
+        call_amount = current_max_bet - player.current_bet
+        if call_amount > player.chips:
+            logger.warning(f"玩家 {player.id} 筹码不足以跟注，需要 {call_amount} 筹码但只有 {player.chips}")
+            return False
+        logger.info(f"玩家 {player.id} 跟注 {call_amount} 筹码")
+        self.call(player.id)
+        return True
+    
+    def _apply_raise(self, player: PlayerState, current_max_bet: int, amount: int) -> bool:
+        """加注到amount"""
+        # 加注金额必须大于当前最大下注
+        if amount <= current_max_bet:
+            logger.warning(f"玩家 {player.id} 加注金额 {amount} 不能小于等于当前最大下注 {current_max_bet}")
+            return False
+        # 加注金额必须大于最小加注
+        if amount - current_max_bet < self.min_raise:
+            logger.warning(f"玩家 {player.id} 加注金额 {amount} 小于最小加注 {self.min_raise}")
+            return False
+        # 加注金额必须在玩家筹码范围内
+        raise_amount = amount - player.current_bet
+        if raise_amount > player.chips:
+            logger.warning(f"玩家 {player.id} 筹码不足以加注，需要 {raise_amount} 筹码但只有 {player.chips}")
+            return False
+        logger.info(f"玩家 {player.id} 加注到 {amount} 筹码")
+        self.raise_bet(player.id, amount)
+        return True
+    
+    def _apply_all_in(self, player: PlayerState, current_max_bet: int, amount: int) -> bool:
+        """全下"""
+        logger.info(f"玩家 {player.id} 选择全下 {player.chips} 筹码")
+        self.all_in(player.id)
+        return True
+    
+    # 动作类型到处理方法的分派表，处理方法返回动作是否合法
+    _ACTION_HANDLERS = {
+        PlayerAction.FOLD: _apply_fold,
+        PlayerAction.CHECK: _apply_check,
+        PlayerAction.CALL: _apply_call,
+        PlayerAction.RAISE: _apply_raise,
+        PlayerAction.ALL_IN: _apply_all_in,
+    }
+    
     def is_round_complete(self) -> bool:
         """
         检查当前回合是否完成
@@ -448,26 +496,13 @@ class GameState:
         Returns:
             bool: 是否成功推进
         """
-        stage_order = [
-            GameStage.WAITING,
-            GameStage.DEALING,
-            GameStage.PRE_FLOP,
-            GameStage.FLOP,
-            GameStage.TURN,
-            GameStage.RIVER,
-            GameStage.SHOWDOWN,
-            GameStage.FINISHED
-        ]
-        
-        try:
-            current_index = stage_order.index(self.stage)
-            if current_index < len(stage_order) - 1:
-                self.stage = stage_order[current_index + 1]
-                if self.stage == GameStage.FINISHED:
-                    self.end_time = datetime.now()
-                return True
-        except ValueError:
-            pass
+        # GameStage按声明顺序取整数值，推进阶段即取下一个值
+        stage = self.stage
+        if isinstance(stage, GameStage) and stage < GameStage.FINISHED:
+            self.stage = GameStage(stage + 1)
+            if self.stage == GameStage.FINISHED:
+                self.end_time = datetime.now()
+            return True
             
         return False
 
@@ -14,6 +14,12 @@ from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 优先使用libyaml的C实现解析配置，未编译libyaml时退回纯Python实现
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
 # 默认配置文件路径
 DEFAULT_CONFIG_PATHS = {
     'llm': 'config/llm.yml',
@@ -62,7 +68,7 @@ def load_config(config_type: str = None, config_path: str = None, force_reload:
             
         # 读取配置文件
         with open(full_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=YamlLoader)
             
         # 处理环境变量
         _process_env_vars(config)
@@ -34,6 +34,9 @@ class LoggerManager:
             
         self._initialized = True
         self.config = self._load_config()
+        # 日志文件路径只解析一次，后续直接复用
+        self._log_file = os.path.abspath(self.config.get('file', 'data/poker.log'))
+        self._log_dir = os.path.dirname(self._log_file)
         self._setup_log_directory()
         atexit.register(self._cleanup)
         
@@ -55,10 +58,7 @@ class LoggerManager:
     
     def _setup_log_directory(self):
         """确保日志目录存在"""
-        log_file = self.config.get('file', 'data/poker.log')
-        log_dir = os.path.dirname(log_file)
-        if log_dir:  # 如果目录不为空
-            os.makedirs(log_dir, exist_ok=True)
+        os.makedirs(self._log_dir, exist_ok=True)
             
     def _cleanup(self):
         """清理资源"""
@@ -96,10 +96,7 @@ class LoggerManager:
                         log_dir = tempfile.gettempdir()
                         log_file = os.path.join(log_dir, f'poker_test_{name}.log')
                     else:
-                        log_file = self.config.get('file', 'data/poker.log')
-                        log_dir = os.path.dirname(log_file)
-                        if log_dir:
-                            os.makedirs(log_dir, exist_ok=True)
+                        log_file = self._log_file
                         
                     # 添加文件处理器，使用完整格式
                     file_handler = logging.handlers.RotatingFileHandler(
@@ -13,6 +13,9 @@ let gameState = {
 // WebSocket连接
 let ws = null;
 
+// 最近一次通过WebSocket收到的完整状态（服务器格式），增量状态在此基础上合并
+let lastServerState = null;
+
 // DOM元素
 const elements = {
     gameId: document.getElementById('game-id'),
@@ -96,6 +99,7 @@ async function initGame() {
 
 // 连接WebSocket
 function connectWebSocket(gameId) {
+    lastServerState = null;  // 新连接的第一帧是完整状态
     ws = new WebSocket(`ws://${window.location.host}/ws/${gameId}`);
     
     ws.onopen = () => {
@@ -120,6 +124,20 @@ function connectWebSocket(gameId) {
 }
 
 // 处理WebSocket消息
+// 合并服务器发送的增量状态，返回新的完整状态
+function applyStatePatch(base, patch) {
+    const { type, removed, player_updates, ...changes } = patch;
+    const state = { ...base, ...changes };
+    (removed || []).forEach(key => delete state[key]);
+    if (player_updates) {
+        state.players = [...state.players];
+        player_updates.forEach(([index, player]) => {
+            state.players[index] = player;
+        });
+    }
+    return state;
+}
+
 function handleWebSocketMessage(message) {
     console.log('收到WebSocket消息:', message);
     
@@ -129,8 +147,19 @@ function handleWebSocketMessage(message) {
         return;
     }
     
+    // 增量状态：合并到上一次收到的完整状态后按完整状态处理
+    if (message.type === 'patch') {
+        if (lastServerState) {
+            handleWebSocketMessage(applyStatePatch(lastServerState, message));
+        } else {
+            console.error('收到增量状态但没有基准状态:', message);
+        }
+        return;
+    }
+    
     // 更新游戏状态
     if (message.phase !== undefined) {
+        lastServerState = message;
         console.log('更新游戏状态:', message);
         console.log('消息中的玩家数据:', message.players);
         
@@ -190,6 +219,10 @@ function handleWebSocketMessage(message) {
     // 处理其他类型的消息
     if (message.type) {
         switch (message.type) {
+            case 'batch':
+                // 服务器将动作后与阶段切换后的状态合并发送，按顺序逐帧处理
+                message.frames.forEach(frame => handleWebSocketMessage(frame));
+                break;
             case 'error':
                 showError(message.message || '发生错误');
                 break;
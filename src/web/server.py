@@ -1,19 +1,21 @@
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import uvicorn
 import os
 import sys
 from pathlib import Path
-from typing import Dict, Any, List
-import json
+from typing import Dict, Any, List, Optional, Tuple
+import orjson
 from datetime import datetime, timezone
 import uuid
 from fastapi.routing import APIRouter
 import asyncio
+import heapq
 import time
+from contextlib import asynccontextmanager
 
 # 添加项目根目录到Python路径
 root_dir = Path(__file__).parent.parent.parent
@@ -21,9 +23,10 @@ sys.path.append(str(root_dir))
 
 from src.utils.logger import get_logger
 from src.utils.config import load_config
-from src.engine.game import TexasHoldemGame, ActionType, PlayerAction
+from src.engine.game import TexasHoldemGame, ActionType, ACTION_TYPES, PlayerAction
 from src.engine.state import GameState, PlayerState, GameStage
 from src.agents.base import GameObservation
+from src.agents.llm import LLMAgent
 
 logger = get_logger(__name__)
 
@@ -35,8 +38,200 @@ web_dir = current_dir
 game_config = load_config('game')
 llm_config = load_config('llm')
 
+# 多进程部署时的工作进程编号，作为游戏ID前缀以便代理按游戏路由
+WORKER_ID = os.getenv("POKER_WORKER_ID")
+
 # 存储活动游戏
 active_games: Dict[str, TexasHoldemGame] = {}
+_game_last_access: Dict[str, float] = {}  # game_id -> 最近访问时间（单调时钟）
+
+# 已结束游戏的回收设置
+FINISHED_GAMES_DIR = root_dir / "data" / "finished_games"
+FINISHED_GAME_GRACE_PERIOD = 300  # 游戏结束且闲置超过该秒数后移出内存
+GAME_GC_INTERVAL = 60  # 回收任务的检查间隔（秒）
+
+def _get_game(game_id: str) -> Optional[TexasHoldemGame]:
+    """获取活动游戏并记录访问时间"""
+    game = active_games.get(game_id)
+    if game is not None:
+        _game_last_access[game_id] = time.monotonic()
+    return game
+
+# 动作和观察的时间戳统一使用UTC
+_UTC = timezone.utc
+
+# 枚举名称查找表，避免每次构建状态时访问枚举的name属性
+_ACTION_NAMES: Dict[ActionType, str] = {action_type: action_type.name for action_type in ActionType}
+_PHASE_NAMES: Dict[GameStage, str] = {stage: stage.name for stage in GameStage}
+
+# 玩家状态快照缓存: game_id -> {player_id: (状态键, 玩家字典)}
+_player_snapshot_cache: Dict[str, Dict[str, Tuple[tuple, dict]]] = {}
+
+def _player_dict(game_id: str, player: PlayerState, last_action_name: Optional[str] = None,
+                 last_amount: Optional[int] = None) -> dict:
+    """
+    构建发送给前端的玩家状态字典，玩家状态未变化时直接复用上次构建的字典
+    
+    Args:
+        game_id: 游戏ID
+        player: 玩家状态
+        last_action_name: 该玩家最近一次动作的名称
+        last_amount: 该玩家最近一次动作的金额
+        
+    Returns:
+        dict: 玩家状态字典
+    """
+    model_name = player.model_name
+    key = (
+        player.chips, player.current_bet, player.is_active, player.is_all_in,
+        player.position, player.cards, model_name, last_action_name, last_amount
+    )
+    
+    game_cache = _player_snapshot_cache.setdefault(game_id, {})
+    cached = game_cache.get(player.id)
+    if cached is not None:
+        if cached[0] == key:
+            return cached[1]
+        # 复制上次的字典后覆盖字段；不能原地修改，batch中较早的帧可能仍引用旧字典
+        player_data = cached[1].copy()
+    else:
+        player_data = {"id": player.id}
+        
+    player_data["chips"] = player.chips
+    player_data["current_bet"] = player.current_bet
+    player_data["is_active"] = player.is_active
+    player_data["cards"] = player.cards  # 始终返回所有玩家的手牌
+    player_data["is_all_in"] = player.is_all_in
+    player_data["position"] = player.position
+    player_data["model_name"] = model_name  # 添加模型名称
+    player_data["last_action"] = last_action_name
+    player_data["last_amount"] = last_amount
+    game_cache[player.id] = (key, player_data)
+    return player_data
+
+def _build_state(game: TexasHoldemGame, last_action: Optional[PlayerAction] = None) -> dict:
+    """
+    构建发送给前端的完整游戏状态
+    
+    Args:
+        game: 游戏实例
+        last_action: 最近一次执行的动作
+        
+    Returns:
+        dict: 游戏状态字典
+    """
+    game_id = game.game_id
+    state = game.state
+    if last_action is not None:
+        last_player = last_action.player_id
+        last_action_name = _ACTION_NAMES[last_action.action_type]
+        last_amount = last_action.amount
+    else:
+        last_player = None
+        last_action_name = None
+        last_amount = None
+        
+    return {
+        "phase": _PHASE_NAMES[game.phase],
+        "pot_size": state.pot,
+        "community_cards": state.community_cards[:],  # 复制一份，避免batch中的前一帧被后续发牌修改
+        "current_player": state.current_player,
+        "min_raise": state.min_raise,
+        "max_raise": state.max_raise,
+        "game_result": state.game_result,
+        "players": [
+            _player_dict(game_id, p, last_action_name, last_amount) if p.id == last_player
+            else _player_dict(game_id, p)
+            for p in state.players_list
+        ]
+    }
+
+# 每个AI玩家复用的观察对象: game_id -> {player_id: (观察对象, {对手ID: 对手信息字典})}
+# 按玩家分开，智能体保存的current_observation不会被其他座位的观察覆盖（包括手牌）
+_observation_buffers: Dict[str, Dict[str, Tuple[GameObservation, Dict[str, dict]]]] = {}
+
+def _observe_game(game: TexasHoldemGame, current_player: PlayerState) -> GameObservation:
+    """
+    生成当前AI玩家的游戏观察，原地更新该玩家复用的观察对象和对手列表
+    
+    Args:
+        game: 游戏实例
+        current_player: 当前行动的玩家
+        
+    Returns:
+        GameObservation: 游戏观察
+    """
+    state = game.state
+    player_buffers = _observation_buffers.setdefault(game.game_id, {})
+    buffer = player_buffers.get(current_player.id)
+    if buffer is None:
+        buffer = (
+            GameObservation(
+                game_id=game.game_id,
+                player_id=current_player.id,
+                phase=_PHASE_NAMES[game.phase],
+                position=current_player.position,
+                timestamp=datetime.now(_UTC),
+                hand_cards=current_player.cards,
+                community_cards=state.community_cards,
+                pot_size=state.pot,
+                current_bet=0,
+                min_raise=0,
+                chips=current_player.chips,
+                is_all_in=current_player.is_all_in,
+                opponents=[],
+                round_actions=state.round_actions,
+                game_actions=state.game_actions
+            ),
+            {}
+        )
+        player_buffers[current_player.id] = buffer
+    observation, opponent_entries = buffer
+    
+    observation.phase = _PHASE_NAMES[game.phase]
+    observation.position = current_player.position
+    observation.timestamp = datetime.now(_UTC)
+    observation.hand_cards = current_player.cards
+    observation.community_cards = state.community_cards
+    observation.pot_size = state.pot
+    observation.current_bet = state.get_max_bet()
+    observation.min_raise = state.min_raise or game.big_blind
+    observation.chips = current_player.chips
+    observation.is_all_in = current_player.is_all_in
+    observation.round_actions = state.round_actions
+    observation.game_actions = state.game_actions
+    
+    # 重新填充对手列表，对手信息字典按玩家复用
+    opponents = observation.opponents
+    opponents.clear()
+    for p in state.get_active_players():
+        if p.id == current_player.id:
+            continue
+        entry = opponent_entries.get(p.id)
+        if entry is None:
+            entry = opponent_entries[p.id] = {"player_id": p.id}
+        entry["chips"] = p.chips
+        entry["current_bet"] = p.current_bet
+        entry["is_active"] = p.is_active
+        entry["is_all_in"] = p.is_all_in
+        entry["position"] = p.position
+        opponents.append(entry)
+        
+    return observation
+
+def _ai_step(ai_player, observation: GameObservation) -> PlayerAction:
+    """
+    让AI玩家观察并决策，在线程池中执行以免LLM请求阻塞事件循环
+    
+    Args:
+        ai_player: AI玩家实例
+        observation: 游戏观察
+        
+    Returns:
+        PlayerAction: AI选择的动作
+    """
+    ai_player.observe(observation)
+    return ai_player.act()
 
 # 请求模型
 class GameConfig(BaseModel):
@@ -44,56 +239,209 @@ class GameConfig(BaseModel):
     initial_stack: int = game_config['game']['initial_chips']
     small_blind: int = game_config['game']['small_blind']
 
+# 心跳消息对所有连接都相同，只编码一次
+_PING_TEXT = orjson.dumps("ping").decode()
+
 class WebSocketManager:
     def __init__(self):
         self.active_connections = {}  # game_id -> WebSocket
-        self.ping_interval = 5  # 30秒发送一次心跳
-        self.last_ping = {}  # game_id -> timestamp
+        self.ping_interval = 5  # 每5秒发送一次心跳
+        self.ping_deadlines = {}  # game_id -> 下一次心跳的时间（事件循环单调时钟）
+        self._ping_heap = []  # (deadline, game_id) 最小堆
+        self._heartbeat_task = None  # 所有连接共享的心跳任务
+        self.last_states = {}  # game_id -> 上一次发送的完整状态，用于计算增量
+        self.last_full_times = {}  # game_id -> 上一次发送完整状态的时间
+        self.full_state_interval = 30  # 每30秒至少发送一次完整状态，便于客户端重新同步
 
     async def connect(self, websocket: WebSocket, game_id: str):
         await websocket.accept()
         self.active_connections[game_id] = websocket
-        self.last_ping[game_id] = time.time()
+        # 新连接的第一帧总是完整状态
+        self.last_states.pop(game_id, None)
+        self.last_full_times.pop(game_id, None)
+        self._schedule_ping(game_id)
         logger.info(f"WebSocket连接已建立: {game_id}")
 
-    def disconnect(self, game_id: str):
+    def disconnect(self, game_id: str, websocket: Optional[WebSocket] = None):
+        if websocket is not None and self.active_connections.get(game_id) is not websocket:
+            return
         if game_id in self.active_connections:
             del self.active_connections[game_id]
-        if game_id in self.last_ping:
-            del self.last_ping[game_id]
+        if game_id in self.ping_deadlines:
+            del self.ping_deadlines[game_id]
+        self.last_states.pop(game_id, None)
+        self.last_full_times.pop(game_id, None)
         logger.info(f"WebSocket连接已断开: {game_id}")
 
     async def send_game_state(self, game_id: str, game_state: dict):
         if game_id in self.active_connections:
-            try:
-                await self.active_connections[game_id].send_json(game_state)
-            except WebSocketDisconnect:
+            game_state = self._state_frame(game_id, game_state)
+            # orjson直接输出bytes，解码为文本帧以兼容前端的JSON.parse
+            await self._send_encoded(game_id, orjson.dumps(game_state, default=str).decode())
+
+    async def _send_encoded(self, game_id: str, payload: str) -> bool:
+        """
+        发送已编码的JSON文本帧
+        
+        Args:
+            game_id: 游戏ID
+            payload: 已编码的消息
+            
+        Returns:
+            bool: 是否发送成功
+        """
+        websocket = self.active_connections.get(game_id)
+        if websocket is None:
+            return False
+        try:
+            await websocket.send_text(payload)
+            return True
+        except WebSocketDisconnect:
+            self.disconnect(game_id)
+            logger.error(f"发送游戏状态时连接断开: {game_id}")
+        except RuntimeError as e:
+            if "after sending 'websocket.close'" in str(e):
+                # 连接已关闭，从活动连接中移除
                 self.disconnect(game_id)
-                logger.error(f"发送游戏状态时连接断开: {game_id}")
-            except RuntimeError as e:
-                if "after sending 'websocket.close'" in str(e):
-                    # 连接已关闭，从活动连接中移除
-                    self.disconnect(game_id)
-                    logger.error(f"连接已关闭，无法发送游戏状态: {game_id}")
-                else:
-                    logger.error(f"发送游戏状态时出错: {str(e)}")
-            except Exception as e:
+                logger.error(f"连接已关闭，无法发送游戏状态: {game_id}")
+            else:
                 logger.error(f"发送游戏状态时出错: {str(e)}")
+        except Exception as e:
+            logger.error(f"发送游戏状态时出错: {str(e)}")
+        return False
+
+    async def send_game_states(self, game_id: str, frames: List[dict]):
+        """发送一个或多个游戏状态，多个状态合并为一条batch消息"""
+        if len(frames) == 1:
+            await self.send_game_state(game_id, frames[0])
+        elif game_id in self.active_connections:
+            # 每一帧相对前一帧计算增量，客户端按顺序合并
+            frames = [self._state_frame(game_id, frame) for frame in frames]
+            await self.send_game_state(game_id, {"type": "batch", "frames": frames})
+
+    def _state_frame(self, game_id: str, state):
+        """
+        把完整游戏状态转换为相对上一次发送状态的增量帧
+        
+        Args:
+            game_id: 游戏ID
+            state: 完整游戏状态，非游戏状态的消息原样返回
+            
+        Returns:
+            完整状态或type为patch的增量帧
+        """
+        if not isinstance(state, dict) or "phase" not in state:
+            return state
+            
+        last = self.last_states.get(game_id)
+        self.last_states[game_id] = state
+        now = time.monotonic()
+        if last is None or now - self.last_full_times.get(game_id, 0) >= self.full_state_interval:
+            self.last_full_times[game_id] = now
+            return state
+            
+        patch = {"type": "patch"}
+        for key, value in state.items():
+            if key != "players" and (key not in last or last[key] != value):
+                patch[key] = value
+        removed = [key for key in last if key not in state]
+        if removed:
+            patch["removed"] = removed
+            
+        # 玩家字典未变化时是同一个缓存对象，只发送变化的玩家
+        players = state["players"]
+        last_players = last["players"]
+        if len(players) != len(last_players):
+            patch["players"] = players
+        else:
+            updates = [
+                [i, player] for i, (player, old) in enumerate(zip(players, last_players))
+                if player is not old and player != old
+            ]
+            if updates:
+                patch["player_updates"] = updates
+        return patch
 
     async def ping(self, game_id: str):
         if game_id in self.active_connections:
+            # 心跳内容固定，直接发送预先编码好的帧；发送失败说明连接已失效，断开后不再安排心跳
+            if not await self._send_encoded(game_id, _PING_TEXT):
+                logger.error(f"发送心跳包失败，断开连接: {game_id}")
+                if game_id in self.active_connections:
+                    self.disconnect(game_id)
+
+    def _schedule_ping(self, game_id: str):
+        """安排下一次心跳，并确保共享心跳任务正在运行"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.ping_interval
+        self.ping_deadlines[game_id] = deadline
+        heapq.heappush(self._ping_heap, (deadline, game_id))
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+
+    async def _heartbeat_loop(self):
+        """按截止时间依次向各连接发送心跳，所有游戏共用一个任务"""
+        loop = asyncio.get_running_loop()
+        while self._ping_heap:
+            deadline, game_id = self._ping_heap[0]
+            delay = deadline - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+                
+            heapq.heappop(self._ping_heap)
+            # 连接已断开或已重新安排的过期条目直接丢弃
+            if self.ping_deadlines.get(game_id) != deadline:
+                continue
+                
+            await self.ping(game_id)
+            if game_id in self.active_connections:
+                next_deadline = deadline + self.ping_interval
+                self.ping_deadlines[game_id] = next_deadline
+                heapq.heappush(self._ping_heap, (next_deadline, game_id))
+
+manager = WebSocketManager()
+
+def _persist_game(game: TexasHoldemGame) -> None:
+    """将已结束的游戏状态写入磁盘"""
+    FINISHED_GAMES_DIR.mkdir(parents=True, exist_ok=True)
+    path = FINISHED_GAMES_DIR / f"{game.game_id}.json"
+    path.write_bytes(orjson.dumps(game.state.model_dump(), default=str))
+
+async def _gc_finished_games():
+    """定期将已结束且闲置的游戏持久化并移出内存"""
+    while True:
+        await asyncio.sleep(GAME_GC_INTERVAL)
+        now = time.monotonic()
+        for game_id, game in list(active_games.items()):
+            # 仅按闲置时间判断；连接中的客户端会定期回复心跳并刷新访问时间
+            if game.phase != GameStage.FINISHED:
+                continue
+            if now - _game_last_access.get(game_id, now) < FINISHED_GAME_GRACE_PERIOD:
+                continue
+                
             try:
-                await self.active_connections[game_id].send_text('ping')
-                self.last_ping[game_id] = time.time()
+                await asyncio.to_thread(_persist_game, game)
             except Exception as e:
-                logger.error(f"发送心跳包时出错: {str(e)}")
-                self.disconnect(game_id)
+                logger.error(f"保存已结束游戏失败: {game_id}, 错误: {str(e)}")
+                continue
+                
+            active_games.pop(game_id, None)
+            _game_last_access.pop(game_id, None)
+            _player_snapshot_cache.pop(game_id, None)
+            _observation_buffers.pop(game_id, None)
+            logger.info(f"已结束的游戏 {game_id} 已保存并移出内存")
 
-manager = WebSocketManager()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """应用生命周期管理，负责启动和停止游戏回收任务"""
+    gc_task = asyncio.create_task(_gc_finished_games())
+    yield
+    gc_task.cancel()
 
 # 创建应用
 def create_app():
-    app = FastAPI()
+    app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
     
     # 添加CORS中间件
     app.add_middleware(
@@ -116,7 +464,7 @@ def create_app():
     async def create_game(config: GameConfig):
         """创建新游戏"""
         try:
-            game_id = str(uuid.uuid4())
+            game_id = f"{WORKER_ID}-{uuid.uuid4()}" if WORKER_ID else str(uuid.uuid4())
             # 使用配置文件中的值
             num_players = game_config['game']['max_players']
             logger.info(f"正在创建游戏: {game_id}, 玩家数量: {num_players}")
@@ -134,8 +482,6 @@ def create_app():
             logger.info(f"添加人类玩家: player_0, 初始筹码: {config.initial_stack}")
             
             # 创建并添加AI玩家，使用配置文件中的玩家数量
-            from src.agents.llm import LLMAgent
-            
             # 创建AI玩家，数量由配置文件决定
             for i in range(1, num_players):
                 agent_id = f"ai_{i}"
@@ -158,21 +504,23 @@ def create_app():
             
             # 保存游戏实例
             active_games[game_id] = game
+            _game_last_access[game_id] = time.monotonic()
             
             # 获取初始游戏状态
             current_player = game.get_current_player()
+            min_raise, max_raise = game.get_raise_bounds("player_0")
             initial_state = {
-                "phase": game.phase.name,
+                "phase": _PHASE_NAMES[game.phase],
                 "pot_size": game.state.pot,
                 "community_cards": game.state.community_cards,
                 "current_player": game.state.current_player or "player_0",
-                "min_raise": max(game.state.get_max_bet() * 2, game.big_blind * 2),
-                "max_raise": game.state.players["player_0"].chips if "player_0" in game.state.players else 0,
+                "min_raise": min_raise,
+                "max_raise": max_raise,
                 "game_result": game.state.game_result,
                 "players": []
             }
             
-            logger.info(f"游戏初始状态: {initial_state}")
+            logger.debug("游戏初始状态: %s", initial_state)
             
             return {
                 "success": True,
@@ -196,12 +544,12 @@ def create_app():
     async def get_game_state(game_id: str):
         """获取游戏状态"""
         try:
-            game = active_games.get(game_id)
+            game = _get_game(game_id)
             if not game:
                 raise HTTPException(status_code=404, detail="游戏不存在")
             
             state = {
-                "phase": game.phase.name,
+                "phase": _PHASE_NAMES[game.phase],
                 "pot_size": game.state.pot,
                 "community_cards": game.state.community_cards,
                 "current_player": game.state.current_player,
@@ -212,18 +560,8 @@ def create_app():
             }
             
             # 转换玩家信息
-            for player in game.state.players:
-                player_info = {
-                    "id": player.id,
-                    "chips": player.chips,
-                    "current_bet": player.current_bet,
-                    "is_active": player.is_active,
-                    "cards": list(player.cards),  # 将元组转换为列表，并始终返回手牌
-                    "is_all_in": player.is_all_in,
-                    "position": player.position,
-                    "model_name": getattr(player, "model_name", None)  # 添加模型名称
-                }
-                state["players"].append(player_info)
+            for player in game.state.players_list:
+                state["players"].append(_player_dict(game_id, player))
             
             return state
             
@@ -234,7 +572,7 @@ def create_app():
     @api_router.post("/games/{game_id}/action")
     async def handle_action(game_id: str, action: Dict[str, Any]):
         """处理玩家动作"""
-        game = active_games.get(game_id)
+        game = _get_game(game_id)
         if not game:
             raise HTTPException(status_code=404, detail="Game not found")
             
@@ -248,6 +586,10 @@ def create_app():
             
             logger.info(f"处理玩家动作: {action}")
             
+            action_type = ACTION_TYPES.get(action["action_type"])
+            if action_type is None:
+                raise HTTPException(status_code=400, detail=f"Invalid action type: {action['action_type']}")
+            
             # 修复加注金额处理
             amount = action.get("amount", 0)
             if action["action_type"] == "RAISE":
@@ -278,77 +620,31 @@ def create_app():
             # 创建动作对象
             player_action = PlayerAction(
                 player_id=action["player_id"],
-                action_type=ActionType[action["action_type"]],
+                action_type=action_type,
                 amount=amount,
-                timestamp=datetime.now()
+                timestamp=datetime.now(_UTC)
             )
             
-            logger.info(f"创建的玩家动作: {player_action.model_dump()}")
+            logger.debug("创建的玩家动作: %s", player_action)
             
             # 处理动作
             game.process_action(player_action)
             
             # 获取更新后的游戏状态
-            updated_state = {
-                "phase": game.phase.name,
-                "pot_size": game.state.pot,
-                "community_cards": game.state.community_cards,
-                "current_player": game.state.current_player,
-                "min_raise": game.state.min_raise,
-                "max_raise": game.state.max_raise,
-                "game_result": game.state.game_result,
-                "players": [
-                    {
-                        "id": p.id,
-                        "chips": p.chips,
-                        "current_bet": p.current_bet,
-                        "is_active": p.is_active,
-                        "cards": p.cards,  # 始终返回所有玩家的手牌
-                        "is_all_in": p.is_all_in,
-                        "position": p.position,
-                        "model_name": getattr(p, "model_name", None),  # 添加模型名称
-                        "last_action": player_action.action_type.name if p.id == player_action.player_id else None,
-                        "last_amount": player_action.amount if p.id == player_action.player_id else None
-                    }
-                    for p in game.state.players.values()
-                ]
-            }
+            updated_state = _build_state(game, player_action)
             
-            logger.info(f"发送更新后的游戏状态: {updated_state}")
+            logger.debug("发送更新后的游戏状态: %s", updated_state)
             
             # 检查是否需要进入下一阶段
             if game.is_round_complete():
                 logger.info("回合结束，进入下一阶段")
                 game.next_phase()
                 # 更新并发送新的游戏状态
-                updated_state = {
-                    "phase": game.phase.name,
-                    "pot_size": game.state.pot,
-                    "community_cards": game.state.community_cards,
-                    "current_player": game.state.current_player,
-                    "min_raise": game.state.min_raise,
-                    "max_raise": game.state.max_raise,
-                    "game_result": game.state.game_result,  # 确保包含游戏结果
-                    "players": [
-                        {
-                            "id": p.id,
-                            "chips": p.chips,
-                            "current_bet": p.current_bet,
-                            "is_active": p.is_active,
-                            "cards": p.cards,  # 始终返回所有玩家的手牌
-                            "is_all_in": p.is_all_in,
-                            "position": p.position,
-                            "model_name": getattr(p, "model_name", None),  # 添加模型名称
-                            "last_action": player_action.action_type.name if p.id == player_action.player_id else None,
-                            "last_amount": player_action.amount if p.id == player_action.player_id else None
-                        }
-                        for p in game.state.players.values()
-                    ]
-                }
+                updated_state = _build_state(game, player_action)
                 
                 # 如果游戏已结束，确保包含完整的游戏结果
                 if game.state.is_game_over and game.state.game_result:
-                    logger.info(f"游戏已结束，发送游戏结果: {game.state.game_result}")
+                    logger.info("游戏已结束，发送游戏结果: %s", game.state.game_result)
                 
                 logger.info(f"游戏进入新阶段: {game.phase.name}")
                 await manager.send_game_state(game_id, updated_state)
@@ -363,7 +659,7 @@ def create_app():
     async def start_new_game(game_id: str):
         """开始新的一局游戏"""
         try:
-            game = active_games.get(game_id)
+            game = _get_game(game_id)
             if not game:
                 raise HTTPException(status_code=404, detail="Game not found")
             
@@ -374,31 +670,11 @@ def create_app():
             game.start_new_game()
             
             # 返回新的游戏状态
+            state = _build_state(game)
+            state["min_raise"] = game.state.min_raise or game.big_blind
             return {
                 "success": True,
-                "state": {
-                    "phase": game.phase.name,
-                    "pot_size": game.state.pot,
-                    "community_cards": game.state.community_cards,
-                    "current_player": game.state.current_player,
-                    "min_raise": game.state.min_raise or game.big_blind,
-                    "max_raise": game.state.max_raise,
-                    "players": [
-                        {
-                            "id": p.id,
-                            "chips": p.chips,
-                            "current_bet": p.current_bet,
-                            "is_active": p.is_active,
-                            "cards": p.cards,  # 始终返回所有玩家的手牌
-                            "is_all_in": p.is_all_in,
-                            "position": p.position,
-                            "model_name": getattr(p, "model_name", None),  # 添加模型名称
-                            "last_action": None,
-                            "last_amount": None
-                        }
-                        for p in game.state.players.values()
-                    ]
-                }
+                "state": state
             }
             
         except Exception as e:
@@ -427,41 +703,15 @@ def create_app():
             await manager.connect(websocket, game_id)
             
             # 发送初始游戏状态
-            game = active_games.get(game_id)
+            game = _get_game(game_id)
             if game:
-                initial_state = {
-                    "phase": game.phase.name,
-                    "pot_size": game.state.pot,
-                    "community_cards": game.state.community_cards,
-                    "current_player": game.state.current_player,
-                    "min_raise": max(game.state.get_max_bet() * 2, game.big_blind * 2),
-                    "max_raise": game.state.players["player_0"].chips if "player_0" in game.state.players else 0,
-                    "game_result": game.state.game_result,
-                    "players": []
-                }
-                
-                # 处理玩家数据
-                for player_id, player_state in game.state.players.items():
-                    player_data = {
-                        "id": player_id,
-                        "chips": player_state.chips,
-                        "current_bet": player_state.current_bet,
-                        "is_active": player_state.is_active,
-                        "cards": player_state.cards,  # 始终返回所有玩家的手牌
-                        "is_all_in": player_state.is_all_in,
-                        "position": player_state.position,
-                        "model_name": getattr(player_state, "model_name", None),  # 添加模型名称
-                        "last_action": None,
-                        "last_amount": None
-                    }
-                    initial_state["players"].append(player_data)
+                state = game.state
+                initial_state = _build_state(game)
+                initial_state["min_raise"], initial_state["max_raise"] = game.get_raise_bounds("player_0")
                 
-                logger.info(f"发送初始游戏状态: {initial_state}")
+                logger.debug("发送初始游戏状态: %s", initial_state)
                 await manager.send_game_state(game_id, initial_state)
                 
-                # 开始心跳检测
-                ping_task = asyncio.create_task(periodic_ping(game_id))
-                
                 try:
                     while True:
                         # 如果当前玩家是AI，自动处理AI的行动
@@ -474,114 +724,42 @@ def create_app():
                                 continue
                                 
                             # 创建观察对象
-                            observation = GameObservation(
-                                game_id=game_id,
-                                player_id=current_player.id,
-                                phase=game.phase.name,
-                                position=current_player.position,
-                                timestamp=datetime.now(),
-                                hand_cards=current_player.cards,
-                                community_cards=game.state.community_cards,
-                                pot_size=game.state.pot,
-                                current_bet=game.state.get_max_bet(),
-                                min_raise=game.state.min_raise or game.big_blind,
-                                chips=current_player.chips,
-                                is_all_in=current_player.is_all_in,
-                                opponents=[
-                                    {
-                                        "player_id": p.id,
-                                        "chips": p.chips,
-                                        "current_bet": p.current_bet,
-                                        "is_active": p.is_active,
-                                        "is_all_in": p.is_all_in,
-                                        "position": p.position
-                                    }
-                                    for p in game.state.get_active_players()
-                                    if p.id != current_player.id
-                                ],
-                                round_actions=game.state.round_actions,
-                                game_actions=game.state.game_actions
-                            )
+                            observation = _observe_game(game, current_player)
                             
                             try:
                                 # AI观察并行动
-                                logger.info(f"AI玩家 {current_player.id} 开始观察游戏状态")
-                                ai_player.observe(observation)
-                                ai_action = ai_player.act()
+                                logger.debug(f"AI玩家 {current_player.id} 开始观察游戏状态")
+                                ai_action = await asyncio.to_thread(_ai_step, ai_player, observation)
                                 
                                 logger.info(f"AI玩家 {current_player.id} 决定执行动作: {ai_action.action_type.name}, 金额: {ai_action.amount}")
                                 game.process_action(ai_action)
                                 
                                 # 更新游戏状态
-                                updated_state = {
-                                    "phase": game.phase.name,
-                                    "pot_size": game.state.pot,
-                                    "community_cards": game.state.community_cards,
-                                    "current_player": game.state.current_player,  # 确保使用游戏引擎中的当前玩家
-                                    "min_raise": game.state.min_raise,
-                                    "max_raise": game.state.max_raise,
-                                    "game_result": game.state.game_result,
-                                    "players": [
-                                        {
-                                            "id": p.id,
-                                            "chips": p.chips,
-                                            "current_bet": p.current_bet,
-                                            "is_active": p.is_active,
-                                            "cards": p.cards,  # 始终返回所有玩家的手牌
-                                            "is_all_in": p.is_all_in,
-                                            "position": p.position,
-                                            "model_name": getattr(p, "model_name", None),  # 添加模型名称
-                                            "last_action": ai_action.action_type.name if p.id == ai_action.player_id else None,
-                                            "last_amount": ai_action.amount if p.id == ai_action.player_id else None
-                                        }
-                                        for p in game.state.players.values()
-                                    ]
-                                }
+                                updated_state = _build_state(game, ai_action)
                                 
                                 # 如果是AI玩家的动作，添加table_talk消息
                                 if hasattr(ai_action, 'table_talk') and ai_action.table_talk:
                                     updated_state["table_talk"] = ai_action.table_talk
                                 
                                 # 发送更新后的状态
-                                logger.info(f"发送AI行动后的游戏状态: {updated_state}")
-                                await manager.send_game_state(game_id, updated_state)
+                                logger.debug("发送AI行动后的游戏状态: %s", updated_state)
+                                frames = [updated_state]
                                 
                                 # 检查是否需要进入下一阶段
                                 if game.is_round_complete():
                                     logger.info("回合结束，进入下一阶段")
                                     game.next_phase()
-                                    # 更新并发送新的游戏状态
-                                    updated_state = {
-                                        "phase": game.phase.name,
-                                        "pot_size": game.state.pot,
-                                        "community_cards": game.state.community_cards,
-                                        "current_player": game.state.current_player,
-                                        "min_raise": game.state.min_raise,
-                                        "max_raise": game.state.max_raise,
-                                        "game_result": game.state.game_result,  # 确保包含游戏结果
-                                        "players": [
-                                            {
-                                                "id": p.id,
-                                                "chips": p.chips,
-                                                "current_bet": p.current_bet,
-                                                "is_active": p.is_active,
-                                                "cards": p.cards,  # 始终返回所有玩家的手牌
-                                                "is_all_in": p.is_all_in,
-                                                "position": p.position,
-                                                "model_name": getattr(p, "model_name", None),  # 添加模型名称
-                                                "last_action": ai_action.action_type.name if p.id == ai_action.player_id else None,
-                                                "last_amount": ai_action.amount if p.id == ai_action.player_id else None
-                                            }
-                                            for p in game.state.players.values()
-                                        ]
-                                    }
+                                    # 更新新的游戏状态，与动作后的状态合并为一次发送
+                                    updated_state = _build_state(game, ai_action)
+                                    frames.append(updated_state)
                                     
                                     # 如果游戏已结束，确保包含完整的游戏结果
-                                    if game.state.is_game_over and game.state.game_result:
-                                        logger.info(f"游戏已结束，发送游戏结果: {game.state.game_result}")
+                                    if state.is_game_over and state.game_result:
+                                        logger.info("游戏已结束，发送游戏结果: %s", state.game_result)
                                     
                                     logger.info(f"游戏进入新阶段: {game.phase.name}")
-                                    await manager.send_game_state(game_id, updated_state)
+                                    
+                                await manager.send_game_states(game_id, frames)
                                 
                             except Exception as e:
                                 logger.error(f"处理AI动作时出错: {str(e)}")
@@ -590,18 +768,20 @@ def create_app():
                         # 等待人类玩家的动作
                         try:
                             data = await websocket.receive_text()
+                            # 客户端每次心跳都会回复pong，连接存续期间游戏不会被判定为闲置
+                            _game_last_access[game_id] = time.monotonic()
                             if data == 'pong':
                                 continue
                                 
-                            message = json.loads(data)
+                            message = orjson.loads(data)
                             logger.info(f"收到玩家行动: {message}")
                             
                             # 处理玩家动作
                             try:
-                                timestamp = datetime.now(timezone.utc)
+                                timestamp = datetime.now(_UTC)
                                 action = PlayerAction(
                                     player_id=message["player_id"],
-                                    action_type=ActionType[message["action"]],
+                                    action_type=ACTION_TYPES[message["action"]],
                                     amount=message.get("amount", 0),
                                     timestamp=timestamp
                                 )
@@ -609,80 +789,36 @@ def create_app():
                                 game.process_action(action)
                                 
                                 # 更新游戏状态
-                                updated_state = {
-                                    "phase": game.phase.name,
-                                    "pot_size": game.state.pot,
-                                    "community_cards": game.state.community_cards,
-                                    "current_player": game.state.current_player,
-                                    "min_raise": game.state.min_raise,
-                                    "max_raise": game.state.max_raise,
-                                    "game_result": game.state.game_result,
-                                    "players": [
-                                        {
-                                            "id": p.id,
-                                            "chips": p.chips,
-                                            "current_bet": p.current_bet,
-                                            "is_active": p.is_active,
-                                            "cards": p.cards,  # 始终返回所有玩家的手牌
-                                            "is_all_in": p.is_all_in,
-                                            "position": p.position,
-                                            "model_name": getattr(p, "model_name", None),  # 添加模型名称
-                                            "last_action": action.action_type.name if p.id == action.player_id else None,
-                                            "last_amount": action.amount if p.id == action.player_id else None
-                                        }
-                                        for p in game.state.players.values()
-                                    ]
-                                }
+                                updated_state = _build_state(game, action)
                                 
                                 # 如果是AI玩家的动作，添加table_talk消息
                                 if hasattr(action, 'table_talk') and action.table_talk:
                                     updated_state["table_talk"] = action.table_talk
                                 
-                                logger.info(f"发送更新后的游戏状态: {updated_state}")
-                                await manager.send_game_state(game_id, updated_state)
+                                logger.debug("发送更新后的游戏状态: %s", updated_state)
+                                frames = [updated_state]
                                 
                                 # 检查是否需要进入下一阶段
                                 if game.is_round_complete():
                                     logger.info("回合结束，进入下一阶段")
                                     game.next_phase()
-                                    # 更新并发送新的游戏状态
-                                    updated_state = {
-                                        "phase": game.phase.name,
-                                        "pot_size": game.state.pot,
-                                        "community_cards": game.state.community_cards,
-                                        "current_player": game.state.current_player,
-                                        "min_raise": game.state.min_raise,
-                                        "max_raise": game.state.max_raise,
-                                        "game_result": game.state.game_result,  # 确保包含游戏结果
-                                        "players": [
-                                            {
-                                                "id": p.id,
-                                                "chips": p.chips,
-                                                "current_bet": p.current_bet,
-                                                "is_active": p.is_active,
-                                                "cards": p.cards,  # 始终返回所有玩家的手牌
-                                                "is_all_in": p.is_all_in,
-                                                "position": p.position,
-                                                "model_name": getattr(p, "model_name", None),  # 添加模型名称
-                                                "last_action": action.action_type.name if p.id == action.player_id else None,
-                                                "last_amount": action.amount if p.id == action.player_id else None
-                                            }
-                                            for p in game.state.players.values()
-                                        ]
-                                    }
+                                    # 更新新的游戏状态，与动作后的状态合并为一次发送
+                                    updated_state = _build_state(game, action)
+                                    frames.append(updated_state)
                                     
                                     # 如果游戏已结束，确保包含完整的游戏结果
-                                    if game.state.is_game_over and game.state.game_result:
-                                        logger.info(f"游戏已结束，发送游戏结果: {game.state.game_result}")
+                                    if state.is_game_over and state.game_result:
+                                        logger.info("游戏已结束，发送游戏结果: %s", state.game_result)
                                     
                                     logger.info(f"游戏进入新阶段: {game.phase.name}")
-                                    await manager.send_game_state(game_id, updated_state)
+                                    
+                                await manager.send_game_states(game_id, frames)
                                 
                             except Exception as e:
                                 logger.error(f"处理玩家动作时出错: {str(e)}")
                                 await websocket.send_json({"error": str(e)})
                                 
-                        except json.JSONDecodeError:
+                        except orjson.JSONDecodeError:
                             logger.error("无效的JSON消息")
                             await websocket.send_json({"error": "无效的消息格式"})
                         except WebSocketDisconnect:
@@ -692,22 +828,13 @@ def create_app():
                             await websocket.send_json({"error": str(e)})
                             
                 except WebSocketDisconnect:
-                    manager.disconnect(game_id)
-                    ping_task.cancel()
+                    pass
                 
         except Exception as e:
             logger.error(f"WebSocket连接出错: {str(e)}")
-            manager.disconnect(game_id)
-
-    async def periodic_ping(game_id: str):
-        """定期发送心跳包"""
-        while True:
-            try:
-                await asyncio.sleep(5)  # 每30秒发送一次心跳
-                await manager.send_game_state(game_id, "ping")
-            except Exception as e:
-                logger.error(f"发送心跳包时出错: {str(e)}")
-                break
+        finally:
+            # 无论客户端正常关闭还是出错都移除连接，只移除本次建立的连接，不影响重连后的新连接
+            manager.disconnect(game_id, websocket)
 
     # 包含API路由
     app.include_router(api_router)
@@ -716,13 +843,81 @@ def create_app():
 
 app = create_app()
 
-if __name__ == "__main__":
+def _run_worker(worker_id: int, host: str, port: int, event_loop: str, http_impl: str) -> None:
+    """
+    启动一个独立的工作进程
+    
+    Args:
+        worker_id: 工作进程编号，作为该进程创建的游戏ID前缀
+        host: 监听地址
+        port: 监听端口
+        event_loop: 事件循环实现
+        http_impl: HTTP协议解析实现
+    """
+    os.environ["POKER_WORKER_ID"] = str(worker_id)
     uvicorn.run(
         "server:app",
-        host="127.0.0.1",
-        port=8000,
-        reload=True,
-        reload_dirs=["src/web"],
-        ws_ping_interval=20,  # 添加 WebSocket ping 间隔
-        ws_ping_timeout=5    # 添加 WebSocket ping 超时
-    ) 
\ No newline at end of file
+        host=host,
+        port=port,
+        loop=event_loop,
+        http=http_impl,
+        ws_ping_interval=20,
+        ws_ping_timeout=5,
+        ws_per_message_deflate=False
+    )
+
+if __name__ == "__main__":
+    import argparse
+    import multiprocessing
+    
+    parser = argparse.ArgumentParser(description="德州扑克Web服务")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址")
+    parser.add_argument("--port", type=int, default=8000, help="监听端口，多进程时依次使用 port, port+1, ...")
+    parser.add_argument("--workers", type=int, default=1, help="工作进程数量，每个进程独立保存自己的游戏，0表示按CPU核数启动")
+    args = parser.parse_args()
+    
+    # uvloop不支持Windows，此时回退到默认的asyncio事件循环
+    try:
+        import uvloop
+        event_loop = "uvloop"
+    except ImportError:
+        event_loop = "asyncio"
+        
+    # 优先使用C实现的httptools解析HTTP请求
+    try:
+        import httptools
+        http_impl = "httptools"
+    except ImportError:
+        http_impl = "auto"
+        
+    # 只有开发环境（ENV=dev）才监视文件变化自动重载
+    dev_mode = os.getenv("ENV") == "dev"
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+        
+    if workers <= 1:
+        uvicorn.run(
+            "server:app",
+            host=args.host,
+            port=args.port,
+            loop=event_loop,
+            http=http_impl,
+            reload=dev_mode,
+            reload_dirs=["src/web"] if dev_mode else None,
+            ws_ping_interval=20,  # 添加 WebSocket ping 间隔
+            ws_ping_timeout=5,    # 添加 WebSocket ping 超时
+            ws_per_message_deflate=False  # 状态帧很小，压缩的CPU开销大于节省的带宽
+        )
+    else:
+        # 游戏状态保存在进程内存中，因此每个进程监听独立端口，
+        # 由前端代理根据游戏ID前缀把同一游戏的请求转发到同一进程
+        processes = [
+            multiprocessing.Process(
+                target=_run_worker,
+                args=(worker_id, args.host, args.port + worker_id, event_loop, http_impl)
+            )
+            for worker_id in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()